@@ -1,27 +1,55 @@
+import array
+
+from instrumentation import Instrumented
+
+
 class Empty(Exception):
     pass
 
 
-import collections
+class Full(Exception):
+    pass
+
+
+class ArrayQueue(Instrumented):
+    """FIFO queue implementation using a Python list as underlying storage.
 
-class ArrayQueue:
-    """FIFO queue implementation using a Python list as underlying storage."""
+    If a typecode is given, elements are stored unboxed in an array.array
+    with that typecode instead, and dequeue_many returns memoryviews.
+    """
     DEFAULT_CAPACITY = 10
+    _INSTRUMENTED = ('enqueue', 'dequeue', 'first', 'enqueue_many', 'dequeue_many')
+    _RESIZES = ('_resize',)
 
-    def __init__(self):
+    def __init__(self, typecode=None):
         """Create an empty queue of size DEFAULT_CAPACITY"""
-        self._data = [None] * ArrayQueue.DEFAULT_CAPACITY
-        self._data = collections.deque(list(), ArrayQueue.DEFAULT_CAPACITY)
+        self._typecode = typecode
+        self._blank = self._new_storage(1)[0]
+        self._data = self._new_storage(ArrayQueue.DEFAULT_CAPACITY)
         self._size = 0
         self._front = 0
 
+    def _new_storage(self, size):
+        """Return empty underlying storage with room for size elements"""
+        if self._typecode is None:
+            return [None] * size
+        return array.array(self._typecode, bytes(array.array(self._typecode).itemsize * size))
+
     def __len__(self):
         """Return the number of elements in the queue"""
         return self._size
 
     def __str__(self):
         """Print the queue"""
-        return str(self._data)
+        return str(list(self))
+
+    def __iter__(self):
+        """Generate the elements of the queue from front to back"""
+        data = self._data
+        walk = self._front
+        for k in range(self._size):
+            yield data[walk]
+            walk = (1 + walk) % len(data)
 
     def is_empty(self):
         """Return True if queue is empty"""
@@ -33,45 +61,91 @@ class ArrayQueue:
             raise Empty("Queue is empty!")
         return self._data[self._front]
 
-    # def dequeue(self):
-    #     """Return the first element off the front of the queue"""
-    #     if self.is_empty():
-    #         raise Empty("Queue is empty!")
-    #     elem = self._data[self._front]
-    #     self._data[self._front] = None
-    #     self._front = (self._front + 1) % len(self._data)
-    #     self._size -= 1
-    #
-    #     return elem
-
     def dequeue(self):
+        """Return the first element off the front of the queue"""
         if self.is_empty():
             raise Empty("Queue is empty!")
+        elem = self._data[self._front]
+        self._data[self._front] = self._blank
+        self._front = (self._front + 1) % len(self._data)
         self._size -= 1
-        return self._data.popleft()
 
-    # def enqueue(self, e):
-    #     """Add an element e to the end of the queue"""
-    #     if (self._front + self._size) == len(self._data):
-    #         self._resize(2 * len(self._data))
-    #     next_avail = self._front + self._size
-    #     self._data[next_avail] = e
-    #     self._size += 1
+        self._shrink()
+        return elem
+
+    def _shrink(self):
+        """Halve the storage while the queue fills less than a quarter of it"""
+        capacity = len(self._data)
+        while ArrayQueue.DEFAULT_CAPACITY < capacity and self._size < capacity // 4:
+            capacity //= 2
+        if capacity != len(self._data):
+            self._resize(capacity)
 
     def enqueue(self, e):
-        self._data.append(e)
+        """Add an element e to the end of the queue"""
+        if self._size == len(self._data):
+            self._resize(2 * len(self._data))
+        next_avail = (self._front + self._size) % len(self._data)
+        self._data[next_avail] = e
         self._size += 1
 
     def _resize(self, size):
-        """Resize list to length size"""
+        """Resize list to length size, moving the front of the queue to index 0"""
         old = self._data
-        self._data = [None] * size
-        walk = self._front
-        for k in range(self._size):
-            self._data[k] = old[k]
-            walk = (1 + walk) % len(old)
+        end = self._front + self._size
+        if end <= len(old):
+            elems = old[self._front:end]
+        else:
+            elems = old[self._front:] + old[:end - len(old)]
+        self._data = elems + self._new_storage(size - self._size)
         self._front = 0
 
+    def enqueue_many(self, elements):
+        """Add all elements of an iterable to the end of the queue"""
+        if self._typecode is None:
+            elems = list(elements)
+        else:
+            elems = array.array(self._typecode, elements)
+        n = len(elems)
+        if self._size + n > len(self._data):
+            capacity = len(self._data)
+            while capacity < self._size + n:
+                capacity *= 2
+            self._resize(capacity)
+
+        capacity = len(self._data)
+        start = (self._front + self._size) % capacity
+        split = min(n, capacity - start)
+        self._data[start:start + split] = elems[:split]
+        self._data[:n - split] = elems[split:]
+        self._size += n
+
+    def dequeue_many(self, n):
+        """Remove and return up to n elements from the front of the queue
+
+        Returns a list, or a memoryview over a copy of the elements if the
+        queue was created with a typecode.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        n = min(n, self._size)
+        capacity = len(self._data)
+        end = self._front + n
+        if end <= capacity:
+            elems = self._data[self._front:end]
+            self._data[self._front:end] = self._new_storage(n)
+        else:
+            elems = self._data[self._front:] + self._data[:end - capacity]
+            self._data[self._front:] = self._new_storage(capacity - self._front)
+            self._data[:end - capacity] = self._new_storage(end - capacity)
+        self._front = end % capacity
+        self._size -= n
+        self._shrink()
+
+        if self._typecode is None:
+            return elems
+        return memoryview(elems)
+
 
 if __name__ == '__main__':
     import unittest
@@ -95,6 +169,60 @@ if __name__ == '__main__':
             self.q.enqueue(10)
             self.q.dequeue()
             self.assertTrue(len(self.q) == 10)
-            print(self.q)
+            self.assertTrue(self.q.first() == 1)
 
-    # unittest.main()
+        def test_wrap_around(self):
+            for i in range(8):
+                self.q.enqueue(i)
+            for i in range(5):
+                self.assertTrue(self.q.dequeue() == i)
+            for i in range(8, 20):
+                self.q.enqueue(i)
+            self.assertTrue(list(self.q) == list(range(5, 20)))
+
+        def test_shrink(self):
+            for i in range(1000):
+                self.q.enqueue(i)
+            for i in range(990):
+                self.assertTrue(self.q.dequeue() == i)
+            self.assertTrue(len(self.q._data) < 100)
+            self.assertTrue(list(self.q) == list(range(990, 1000)))
+
+        def test_bulk(self):
+            self.q.enqueue_many(range(5))
+            self.q.dequeue_many(3)
+            self.q.enqueue_many(range(5, 25))
+            self.assertTrue(self.q.dequeue_many(4) == [3, 4, 5, 6])
+            self.assertTrue(list(self.q) == list(range(7, 25)))
+            self.assertTrue(self.q.dequeue_many(100) == list(range(7, 25)))
+            self.assertTrue(self.q.is_empty())
+
+    class testTypedArrayQueue(unittest.TestCase):
+        def setUp(self):
+            self.q = ArrayQueue('d')
+
+        def test_enqueue_dequeue(self):
+            for i in range(25):
+                self.q.enqueue(i / 2)
+            self.assertTrue(self.q.first() == 0.0)
+            for i in range(25):
+                self.assertTrue(self.q.dequeue() == i / 2)
+            self.assertTrue(self.q.is_empty())
+
+        def test_bulk(self):
+            self.q.enqueue_many([1.5] * 8)
+            self.q.dequeue_many(6)
+            self.q.enqueue_many(float(i) for i in range(12))
+            view = self.q.dequeue_many(5)
+            self.assertTrue(isinstance(view, memoryview) and view.format == 'd')
+            self.assertTrue(view.tolist() == [1.5, 1.5, 0.0, 1.0, 2.0])
+            self.assertTrue(list(self.q) == [float(i) for i in range(3, 12)])
+
+        def test_unicode(self):
+            q = ArrayQueue('u')
+            for c in 'abcdefghijklmnopqrstuvwxyz':
+                q.enqueue(c)
+            self.assertTrue(q.dequeue() == 'a' and q._data[0] == '\x00')
+            self.assertTrue(q.dequeue_many(3).tobytes() == array.array('u', 'bcd').tobytes())
+
+    unittest.main()
@@ -0,0 +1,172 @@
+import array
+
+from arrayQueue import Empty
+from instrumentation import Instrumented
+
+
+class ArrayStack(Instrumented):
+    """LIFO stack implementation using a Python list as underlying storage.
+
+    No object is allocated per push: elements go into preallocated slots and
+    the storage doubles when it is full. If a typecode is given, elements are
+    stored unboxed in an array.array with that typecode instead, and pop_many
+    returns memoryviews. With shrink=True the storage is halved while the
+    stack fills less than a quarter of it.
+    """
+    DEFAULT_CAPACITY = 16
+    _INSTRUMENTED = ('push', 'pop', 'top', 'push_many', 'pop_many')
+    _RESIZES = ('_resize',)
+
+    def __init__(self, typecode=None, shrink=False):
+        """Create an empty stack of capacity DEFAULT_CAPACITY"""
+        self._typecode = typecode
+        self._blank = self._new_storage(1)[0]
+        self._shrink_enabled = shrink
+        self._data = self._new_storage(ArrayStack.DEFAULT_CAPACITY)
+        self._size = 0
+
+    def _new_storage(self, size):
+        """Return empty underlying storage with room for size elements"""
+        if self._typecode is None:
+            return [None] * size
+        return array.array(self._typecode, bytes(array.array(self._typecode).itemsize * size))
+
+    def __len__(self):
+        """Return the number of elements in the stack"""
+        return self._size
+
+    def __iter__(self):
+        """Generate the elements of the stack from top to bottom"""
+        data = self._data
+        for k in range(self._size - 1, -1, -1):
+            yield data[k]
+
+    def is_empty(self):
+        """Return True if the stack is empty"""
+        return self._size == 0
+
+    def push(self, e):
+        """Push an element e to the top of the stack"""
+        if self._size == len(self._data):
+            self._resize(2 * len(self._data))
+        self._data[self._size] = e
+        self._size += 1
+
+    def top(self):
+        """Return (but do not remove) the element at the top of the stack"""
+        if self._size == 0:
+            raise Empty("Stack is empty")
+        return self._data[self._size - 1]
+
+    def pop(self):
+        """Pop the element off the top of the stack"""
+        if self._size == 0:
+            raise Empty("Stack is empty")
+        self._size -= 1
+        top = self._data[self._size]
+        self._data[self._size] = self._blank
+        if self._shrink_enabled:
+            self._shrink()
+        return top
+
+    def push_many(self, elements):
+        """Push every element of an iterable, the last one ending on top"""
+        if self._typecode is None:
+            elems = list(elements)
+        else:
+            elems = array.array(self._typecode, elements)
+        end = self._size + len(elems)
+        if end > len(self._data):
+            capacity = len(self._data)
+            while capacity < end:
+                capacity *= 2
+            self._resize(capacity)
+        self._data[self._size:end] = elems
+        self._size = end
+
+    def pop_many(self, n):
+        """Pop and return up to n elements, topmost first
+
+        Returns a list, or a memoryview over a copy of the elements if the
+        stack was created with a typecode.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        n = min(n, self._size)
+        start = self._size - n
+        elems = self._data[start:self._size]
+        elems.reverse()
+        self._data[start:self._size] = self._new_storage(n)
+        self._size = start
+        if self._shrink_enabled:
+            self._shrink()
+
+        if self._typecode is None:
+            return elems
+        return memoryview(elems)
+
+    def _shrink(self):
+        """Halve the storage while the stack fills less than a quarter of it"""
+        capacity = len(self._data)
+        while ArrayStack.DEFAULT_CAPACITY < capacity and self._size < capacity // 4:
+            capacity //= 2
+        if capacity != len(self._data):
+            self._resize(capacity)
+
+    def _resize(self, size):
+        """Resize storage to length size, keeping the elements"""
+        self._data = self._data[:self._size] + self._new_storage(size - self._size)
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class TestArrayStack(unittest.TestCase):
+
+        def setUp(self):
+            self.s = ArrayStack()
+
+        def test_push_pop(self):
+            with self.assertRaises(Empty):
+                self.s.pop()
+            with self.assertRaises(Empty):
+                self.s.top()
+            for i in range(100):
+                self.s.push(i)
+                self.assertTrue(self.s.top() == i)
+            self.assertTrue(len(self.s) == 100 and list(self.s)[:2] == [99, 98])
+            for i in range(99, -1, -1):
+                self.assertTrue(self.s.pop() == i)
+            self.assertTrue(self.s.is_empty() and len(self.s._data) == 128)
+
+        def test_bulk(self):
+            self.s.push(0)
+            self.s.push_many(range(1, 40))
+            self.assertTrue(len(self.s) == 40 and self.s.top() == 39)
+            self.assertTrue(self.s.pop_many(3) == [39, 38, 37])
+            with self.assertRaises(ValueError):
+                self.s.pop_many(-1)
+            self.assertTrue(self.s.pop_many(100) == list(range(36, -1, -1)))
+            self.assertTrue(self.s.pop_many(1) == [] and self.s._data[0] is None)
+
+        def test_shrink(self):
+            s = ArrayStack(shrink=True)
+            s.push_many(range(1000))
+            for i in range(990):
+                s.pop()
+            self.assertTrue(len(s._data) == 32 and list(s) == list(range(9, -1, -1)))
+            s.pop_many(10)
+            self.assertTrue(len(s._data) == ArrayStack.DEFAULT_CAPACITY)
+
+        def test_typed(self):
+            s = ArrayStack('d')
+            s.push_many([0.5, 1.5])
+            s.push(2.5)
+            view = s.pop_many(2)
+            self.assertTrue(view.format == 'd' and view.tolist() == [2.5, 1.5])
+            self.assertTrue(s.pop() == 0.5 and s.is_empty())
+            s = ArrayStack('u')
+            s.push_many('abc')
+            self.assertTrue(s.pop() == 'c' and list(s) == ['b', 'a'])
+
+    unittest.main()
@@ -0,0 +1,224 @@
+import asyncio
+import collections
+
+from arrayQueue import ArrayQueue
+from arrayQueue import Empty
+from arrayQueue import Full
+from circularlyLinkedList import CircularQueue
+
+
+class _AsyncQueue:
+    """Base class adapting a FIFO queue for coroutines running on one event loop
+
+    Elements stay in the wrapped queue's own storage; waiting producers and
+    consumers are parked on futures that are resolved one at a time as room
+    or elements become available.
+    """
+
+    def __init__(self, queue, maxsize=0):
+        """Wrap an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        self._queue = queue
+        self._maxsize = maxsize
+        self._getters = collections.deque()
+        self._putters = collections.deque()
+        self._closed = False
+
+    def __len__(self):
+        """Return the number of elements in the queue"""
+        return len(self._queue)
+
+    def __aiter__(self):
+        """Iterate asynchronously over elements as they arrive, until the queue is closed and drained"""
+        return self
+
+    async def __anext__(self):
+        """Return the next element, stopping once the queue is closed and drained"""
+        try:
+            return await self.get()
+        except Empty:
+            raise StopAsyncIteration
+
+    def is_empty(self):
+        """Return True if queue is empty"""
+        return len(self._queue) == 0
+
+    def is_full(self):
+        """Return True if a bounded queue holds maxsize elements"""
+        return 0 < self._maxsize <= len(self._queue)
+
+    def close(self):
+        """Refuse further puts and wake every waiting producer and consumer
+
+        Blocked producers raise ValueError. Consumers keep receiving the
+        remaining elements; once the queue is drained get() raises Empty and
+        async iteration stops.
+        """
+        self._closed = True
+        while self._getters:
+            self._wakeup_next(self._getters)
+        while self._putters:
+            self._wakeup_next(self._putters)
+
+    def _wakeup_next(self, waiters):
+        """Resolve the first waiter that is still pending"""
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters):
+        """Park the calling coroutine on a new future in waiters until it is woken"""
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                # Already woken; pass the wakeup on so it is not lost
+                self._wakeup_next(waiters)
+            raise
+
+    async def put(self, e):
+        """Add element e to the back of the queue, waiting while it is full"""
+        while self.is_full() and not self._closed:
+            await self._wait(self._putters)
+        self.put_nowait(e)
+
+    def put_nowait(self, e):
+        """Add element e without waiting, raising Full if there is no room"""
+        if self._closed:
+            raise ValueError("Queue is closed")
+        if self.is_full():
+            raise Full("Queue is full")
+        self._queue.enqueue(e)
+        self._wakeup_next(self._getters)
+
+    async def get(self):
+        """Remove and return the element at the front of the queue, waiting while it is empty"""
+        while self.is_empty() and not self._closed:
+            await self._wait(self._getters)
+        return self.get_nowait()
+
+    def get_nowait(self):
+        """Remove and return the front element without waiting, raising Empty if there is none"""
+        if self.is_empty():
+            raise Empty("Queue is empty")
+        e = self._queue.dequeue()
+        self._wakeup_next(self._putters)
+        return e
+
+    async def get_batch(self, max_n, timeout=None):
+        """Remove and return a list of up to max_n elements from the front of the queue
+
+        Waits up to timeout seconds (forever if None) for the first element
+        and returns an empty list if none arrives, then takes whatever else
+        is already queued in one bulk dequeue. An AsyncArrayQueue created
+        with a typecode returns the elements as a memoryview instead, over a
+        copy that the queue never touches again, so it stays valid after
+        later operations and needs no explicit release.
+        """
+        if self.is_empty() and not self._closed:
+            try:
+                await asyncio.wait_for(self._wait_for_elements(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if self.is_empty():
+            raise Empty("Queue is empty")
+
+        elems = self._queue.dequeue_many(max_n)
+        for k in range(len(elems)):
+            if not self._putters:
+                break
+            self._wakeup_next(self._putters)
+        return elems
+
+    async def _wait_for_elements(self):
+        """Wait until the queue holds an element or is closed"""
+        while self.is_empty() and not self._closed:
+            await self._wait(self._getters)
+
+
+class AsyncArrayQueue(_AsyncQueue):
+    """Awaitable, optionally bounded FIFO queue stored in an ArrayQueue ring buffer"""
+
+    def __init__(self, maxsize=0, typecode=None):
+        """Create an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        super().__init__(ArrayQueue(typecode), maxsize)
+
+
+class AsyncCircularQueue(_AsyncQueue):
+    """Awaitable, optionally bounded FIFO queue stored in a CircularQueue"""
+
+    def __init__(self, maxsize=0, pool=None):
+        """Create an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        super().__init__(CircularQueue(pool), maxsize)
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class TestAsyncArrayQueue(unittest.IsolatedAsyncioTestCase):
+
+        def setUp(self):
+            self.q = AsyncArrayQueue(2)
+
+        async def test_nowait(self):
+            with self.assertRaises(Empty):
+                self.q.get_nowait()
+            self.q.put_nowait(1)
+            self.q.put_nowait(2)
+            with self.assertRaises(Full):
+                self.q.put_nowait(3)
+            self.assertTrue(self.q.get_nowait() == 1)
+
+        async def test_backpressure(self):
+            async def produce():
+                for i in range(10):
+                    await self.q.put(i)
+                self.q.close()
+
+            producer = asyncio.ensure_future(produce())
+            received = [e async for e in self.q]
+            await producer
+            self.assertTrue(received == list(range(10)))
+            with self.assertRaises(ValueError):
+                await self.q.put(10)
+
+        async def test_get_batch(self):
+            self.assertTrue(await self.q.get_batch(5, timeout=0.01) == [])
+            batch = asyncio.ensure_future(self.q.get_batch(5))
+            await self.q.put(1)
+            await self.q.put(2)
+            await asyncio.sleep(0)
+            producer = asyncio.ensure_future(self.q.put(3))
+            self.assertTrue(await batch == [1, 2])
+            await producer
+            self.assertTrue(self.q.get_nowait() == 3)
+
+        async def test_typed_batch(self):
+            q = AsyncArrayQueue(4, typecode='d')
+            await q.put(0.5)
+            await q.put(1.5)
+            batch = await q.get_batch(5)
+            await q.put(2.5)
+            self.assertTrue(isinstance(batch, memoryview) and batch.format == 'd')
+            self.assertTrue(batch.tolist() == [0.5, 1.5] and q.get_nowait() == 2.5)
+
+        async def test_cancelled_get(self):
+            getter = asyncio.ensure_future(self.q.get())
+            await asyncio.sleep(0)
+            getter.cancel()
+            await asyncio.sleep(0)
+            self.q.put_nowait(1)
+            self.assertTrue(await self.q.get() == 1)
+
+    class TestAsyncCircularQueue(TestAsyncArrayQueue):
+
+        def setUp(self):
+            self.q = AsyncCircularQueue(2)
+
+    unittest.main()
@@ -1,9 +1,16 @@
+from arrayQueue import Full
+from instrumentation import Instrumented
+from nodePool import NodePool
+
+
 class Empty(Exception):
     pass
 
 
-class CircularQueue:
+class CircularQueue(Instrumented):
     """Queue implementation using circularly linked list for storage"""
+    _INSTRUMENTED = ('enqueue', 'dequeue', 'first', 'enqueue_many', 'dequeue_many', 'rotate')
+    _SEARCHES = ('get_Node',)
 
     class _Node:
         """Lightweight, nonpublic class for storing a singly linked node"""
@@ -14,10 +21,29 @@ class CircularQueue:
             self._element = element
             self.next = None
 
-    def __init__(self):
-        """Create an empty queue"""
+    def __init__(self, pool=None, capacity=None, overwrite=False):
+        """Create an empty queue, optionally recycling nodes through a NodePool
+
+        With a capacity, capacity nodes are allocated up front and recycled,
+        so enqueue never allocates. Once the ring is full, enqueue raises
+        Full, or with overwrite=True replaces the oldest element in O(1) and
+        counts it in dropped.
+        """
+        if capacity is not None:
+            if capacity <= 0:
+                raise ValueError("capacity must be positive")
+            if pool is not None:
+                raise ValueError("a bounded queue preallocates its own nodes")
+            pool = NodePool(capacity)
+            for k in range(capacity):
+                pool.put(self._Node(None))
         self._tail = None
         self._size = 0
+        self._pool = pool
+        self._index = None
+        self._capacity = capacity
+        self._overwrite = overwrite
+        self.dropped = 0
 
     def __len__(self):
         """Return the number of elements in the queue"""
@@ -27,6 +53,41 @@ class CircularQueue:
         """Return True if the list is empty"""
         return self._size == 0
 
+    def is_full(self):
+        """Return True if a bounded queue holds capacity elements"""
+        return self._size == self._capacity
+
+    def enable_index(self):
+        """Maintain a hash index from element to nodes so get_Node takes O(1) time
+
+        Elements must be hashable while the index is enabled.
+        """
+        self._index = {}
+        if self._tail is not None:
+            walk = self._tail.next
+            for k in range(self._size):
+                self._index_add(walk)
+                walk = walk.next
+
+    def disable_index(self):
+        """Stop maintaining the element index"""
+        self._index = None
+
+    def _index_add(self, node):
+        """Record node under its element"""
+        nodes = self._index.get(node._element)
+        if nodes is None:
+            self._index[node._element] = {node}
+        else:
+            nodes.add(node)
+
+    def _index_discard(self, node):
+        """Forget node under its element"""
+        nodes = self._index[node._element]
+        nodes.discard(node)
+        if not nodes:
+            del self._index[node._element]
+
     def first(self):
         """Return (but do not remove) the first element in the list"""
 
@@ -40,6 +101,8 @@ class CircularQueue:
         if self.is_empty():
             raise Empty("List is empty")
         oldhead = self._tail.next
+        if self._index is not None:
+            self._index_discard(oldhead)
 
         if self._size == 1:
             self._tail = None
@@ -47,11 +110,22 @@ class CircularQueue:
             self._tail.next= oldhead.next
         self._size -= 1
 
-        return oldhead._element
+        elem = oldhead._element
+        if self._pool is not None:
+            oldhead._element = oldhead.next = None
+            self._pool.put(oldhead)
+        return elem
 
     def enqueue(self, e):
         """Add an element to the back of the queue"""
-        newest = self._Node(e)
+        if self._size == self._capacity:
+            self._overwrite_oldest(e)
+            return
+        newest = self._pool.get() if self._pool is not None else None
+        if newest is None:
+            newest = self._Node(e)
+        else:
+            newest._element = e
         if self.is_empty():
             newest.next= newest
         else:
@@ -60,6 +134,81 @@ class CircularQueue:
         self._tail = newest
         self._size += 1
 
+        if self._index is not None:
+            self._index_add(newest)
+
+    def _overwrite_oldest(self, e):
+        """Store e in the front node of a full ring and make that node the back"""
+        if not self._overwrite:
+            raise Full("Queue is full")
+        oldest = self._tail.next
+        if self._index is not None:
+            self._index_discard(oldest)
+        oldest._element = e
+        self._tail = oldest
+        self.dropped += 1
+        if self._index is not None:
+            self._index_add(oldest)
+
+    def enqueue_many(self, elements):
+        """Add all elements of an iterable to the back of the queue"""
+        if self._capacity is not None:
+            for e in elements:
+                self.enqueue(e)
+            return
+        Node = self._Node
+        first = last = Node(None)
+        count = 0
+        for e in elements:
+            last.next = Node(e)
+            last = last.next
+            count += 1
+        if count == 0:
+            return
+
+        if self._index is not None:
+            walk = first.next
+            while walk is not None:
+                self._index_add(walk)
+                walk = walk.next
+
+        if self.is_empty():
+            last.next = first.next
+        else:
+            last.next = self._tail.next
+            self._tail.next = first.next
+        self._tail = last
+        self._size += count
+
+    def dequeue_many(self, n):
+        """Remove and return a list of up to n elements from the front of the queue"""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        n = min(n, self._size)
+        elems = []
+        if n == 0:
+            return elems
+        walk = self._tail.next
+        for k in range(n):
+            elems.append(walk._element)
+            if self._index is not None:
+                self._index_discard(walk)
+            old, walk = walk, walk.next
+            if self._pool is not None:
+                old._element = old.next = None
+                self._pool.put(old)
+        self._size -= n
+
+        if self.is_empty():
+            self._tail = None
+        else:
+            self._tail.next = walk
+        return elems
+
+    def snapshot(self):
+        """Return a list of the elements from front to back, in O(n) time"""
+        return [node._element for node in self._iter_nodes()]
+
     def rotate(self):
         """Rotate front element to the back of the queue"""
         if self._size > 0:
@@ -78,12 +227,28 @@ class CircularQueue:
         return result
 
     def get_Node(self, value):
-        curr = self._tail
+        """Return the first node from the front holding value, or None if there is none"""
+        if self._tail is None:
+            return None
 
-        while curr is not None and curr._element != value:
-            curr = curr.next
+        if self._index is not None:
+            nodes = self._index.get(value)
+            if nodes is None:
+                return None
+            if len(nodes) == 1:
+                return next(iter(nodes))
 
-        return curr
+        for node in self._iter_nodes():
+            if node._element == value:
+                return node
+        return None
+
+    def _iter_nodes(self):
+        """Generate the nodes of the queue from front to back"""
+        curr = self._tail.next if self._tail is not None else None
+        for k in range(self._size):
+            yield curr
+            curr = curr.next
 
 def sameList(a, b):
     """Find out if two nodes are in the same circularly linked list"""
@@ -115,6 +280,64 @@ if __name__ == "__main__":
             self.cq.enqueue(2)
             self.assertTrue(self.cq.num_elements() == 2)
 
+        def test_bulk(self):
+            self.cq.enqueue_many(range(5))
+            self.assertTrue(self.cq.num_elements() == 5)
+            self.assertTrue(self.cq.dequeue_many(2) == [0, 1])
+            with self.assertRaises(ValueError):
+                self.cq.dequeue_many(-1)
+            self.cq.enqueue_many(range(5, 8))
+            self.assertTrue(self.cq.dequeue_many(10) == [2, 3, 4, 5, 6, 7])
+            self.assertTrue(self.cq.is_empty())
+            self.assertTrue(self.cq.dequeue_many(1) == [])
+
+        def test_node_pool(self):
+            pool = NodePool(8)
+            self.cq = CircularQueue(pool)
+            for i in range(4):
+                self.cq.enqueue(i)
+            self.cq.dequeue()
+            self.cq.enqueue(4)
+            self.assertTrue(pool.hits == 1)
+            self.assertTrue(self.cq.dequeue_many(4) == [1, 2, 3, 4])
+            self.assertTrue(len(pool) == 4)
+
+        def test_overwrite(self):
+            cq = CircularQueue(capacity=4, overwrite=True)
+            nodes = {id(n) for n in cq._pool._free}
+            cq.enqueue_many(range(10))
+            self.assertTrue(cq.snapshot() == [6, 7, 8, 9] and cq.is_full() and cq.dropped == 6)
+            self.assertTrue(cq.dequeue() == 6 and cq.first() == 7)
+            cq.enable_index()
+            cq.enqueue(10)
+            cq.enqueue(11)
+            self.assertTrue(cq.snapshot() == [8, 9, 10, 11] and cq.dropped == 7)
+            self.assertTrue(cq.get_Node(11) is cq._tail and cq.get_Node(7) is None)
+            self.assertTrue({id(n) for n in cq._iter_nodes()} == nodes)
+            self.assertTrue(cq._pool.misses == 0)
+
+        def test_bounded(self):
+            cq = CircularQueue(capacity=2)
+            cq.enqueue(1)
+            cq.enqueue(2)
+            with self.assertRaises(Full):
+                cq.enqueue(3)
+            self.assertTrue(cq.dequeue_many(5) == [1, 2] and len(cq._pool) == 2)
+            with self.assertRaises(ValueError):
+                CircularQueue(NodePool(), capacity=2)
+
+        def test_get_node(self):
+            self.assertIsNone(self.cq.get_Node(1))
+            self.cq.enqueue_many([1, 2, 3, 2])
+            self.assertIsNone(self.cq.get_Node(5))
+            self.cq.enable_index()
+            self.assertTrue(self.cq.get_Node(2) is self.cq._tail.next.next)
+            self.cq.dequeue_many(2)
+            self.assertTrue(self.cq.get_Node(2) is self.cq._tail)
+            self.cq.enqueue(5)
+            self.assertTrue(self.cq.get_Node(5) is self.cq._tail)
+            self.assertIsNone(self.cq.get_Node(1))
+
 
     cq = CircularQueue()
     cq1 = CircularQueue()
@@ -126,3 +349,5 @@ if __name__ == "__main__":
     b = cq1.get_Node(2)
 
     print(sameList(b, b))
+
+    unittest.main()
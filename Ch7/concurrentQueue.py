@@ -0,0 +1,187 @@
+import threading
+
+from arrayQueue import ArrayQueue
+from arrayQueue import Empty
+from arrayQueue import Full
+from singlyLinkedLists import LinkedQueue
+
+
+class _ConcurrentQueue:
+    """Base class making a FIFO queue safe to share between threads
+
+    Every operation holds a single lock, so the size and the head/tail links
+    of the underlying queue always change together. Producers block while a
+    bounded queue is full and consumers block while it is empty.
+    """
+
+    def __init__(self, queue, maxsize=0):
+        """Wrap an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        self._queue = queue
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self):
+        """Return the number of elements in the queue"""
+        with self._lock:
+            return len(self._queue)
+
+    def is_empty(self):
+        """Return True if queue is empty"""
+        return len(self) == 0
+
+    def is_full(self):
+        """Return True if a bounded queue holds maxsize elements"""
+        with self._lock:
+            return self._has_no_room()
+
+    def _has_no_room(self):
+        """Return True if a bounded queue is full; the lock must be held"""
+        return 0 < self._maxsize <= len(self._queue)
+
+    def _has_room(self):
+        """Return True if an element can be added; the lock must be held"""
+        return not self._has_no_room()
+
+    def _has_elements(self):
+        """Return True if an element can be removed; the lock must be held"""
+        return len(self._queue) > 0
+
+    def _wait(self, condition, ready, block, timeout, exception):
+        """Wait on condition until ready() holds, raising exception if it never does"""
+        if not block:
+            raise exception("Queue is {}".format("full" if exception is Full else "empty"))
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout must be non-negative")
+        if not condition.wait_for(ready, timeout):
+            raise exception("Timed out waiting for the queue")
+
+    def put(self, e, block=True, timeout=None):
+        """Add element e to the back of the queue, waiting for room if it is full
+
+        Raise Full if no room frees up within timeout seconds, or at once if
+        block is False.
+        """
+        with self._not_full:
+            if self._has_no_room():
+                self._wait(self._not_full, self._has_room, block, timeout, Full)
+            self._queue.enqueue(e)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the element at the front of the queue, waiting for one if empty
+
+        Raise Empty if nothing arrives within timeout seconds, or at once if
+        block is False.
+        """
+        with self._not_empty:
+            if not len(self._queue):
+                self._wait(self._not_empty, self._has_elements, block, timeout, Empty)
+            e = self._queue.dequeue()
+            self._not_full.notify()
+            return e
+
+    def put_nowait(self, e):
+        """Add element e without waiting, raising Full if there is no room"""
+        self.put(e, block=False)
+
+    def get_nowait(self):
+        """Remove and return the front element without waiting, raising Empty if there is none"""
+        return self.get(block=False)
+
+    def get_many(self, n, block=True, timeout=None):
+        """Remove and return up to n elements from the front under a single lock acquisition
+
+        Waits like get() until at least one element is available.
+        """
+        with self._not_empty:
+            if not len(self._queue):
+                self._wait(self._not_empty, self._has_elements, block, timeout, Empty)
+            elems = self._queue.dequeue_many(n)
+            self._not_full.notify(len(elems))
+            return elems
+
+
+class ConcurrentArrayQueue(_ConcurrentQueue):
+    """Thread-safe, optionally bounded FIFO queue stored in an ArrayQueue ring buffer"""
+
+    def __init__(self, maxsize=0, typecode=None):
+        """Create an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        super().__init__(ArrayQueue(typecode), maxsize)
+
+
+class ConcurrentLinkedQueue(_ConcurrentQueue):
+    """Thread-safe, optionally bounded FIFO queue stored in a LinkedQueue"""
+
+    def __init__(self, maxsize=0, pool=None):
+        """Create an empty queue holding at most maxsize elements (unbounded if maxsize <= 0)"""
+        super().__init__(LinkedQueue(pool), maxsize)
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class TestConcurrentArrayQueue(unittest.TestCase):
+
+        def setUp(self):
+            self.q = ConcurrentArrayQueue(3)
+
+        def test_fifo(self):
+            for i in range(3):
+                self.q.put(i)
+            self.assertTrue(self.q.is_full())
+            self.assertTrue(self.q.get() == 0)
+            self.assertTrue(self.q.get_many(5) == [1, 2])
+            self.assertTrue(self.q.is_empty())
+
+        def test_nonblocking(self):
+            with self.assertRaises(Empty):
+                self.q.get_nowait()
+            for i in range(3):
+                self.q.put_nowait(i)
+            with self.assertRaises(Full):
+                self.q.put_nowait(3)
+
+        def test_timeouts(self):
+            with self.assertRaises(Empty):
+                self.q.get(timeout=0.01)
+            with self.assertRaises(Empty):
+                self.q.get_many(2, timeout=0.01)
+            for i in range(3):
+                self.q.put(i)
+            with self.assertRaises(Full):
+                self.q.put(3, timeout=0.01)
+
+        def test_threads(self):
+            total = 2000
+            received = []
+
+            def produce(start):
+                for i in range(start, total, 4):
+                    self.q.put(i)
+
+            def consume():
+                while True:
+                    batch = self.q.get_many(10)
+                    if -1 in batch:
+                        received.extend(e for e in batch if e != -1)
+                        return
+                    received.extend(batch)
+
+            producers = [threading.Thread(target=produce, args=(i,)) for i in range(4)]
+            consumer = threading.Thread(target=consume)
+            for t in producers + [consumer]:
+                t.start()
+            for t in producers:
+                t.join()
+            self.q.put(-1)
+            consumer.join()
+            self.assertTrue(sorted(received) == list(range(total)))
+
+    class TestConcurrentLinkedQueue(TestConcurrentArrayQueue):
+
+        def setUp(self):
+            self.q = ConcurrentLinkedQueue(3)
+
+    unittest.main()
@@ -1,8 +1,14 @@
+import array
+
+from instrumentation import Instrumented
+from rankedSkipList import RankedSkipList
+
+
 class Empty(Exception):
     pass
 
 
-class _DoublyLinkedBase:
+class _DoublyLinkedBase(Instrumented):
     """A base class providing a doubly linked list representation"""
 
     class _Node:
@@ -14,8 +20,11 @@ class _DoublyLinkedBase:
             self._prev = prev
             self._next = next
 
-    def __init__(self):
-        """Create an empty doubly linked list"""
+    def __init__(self, pool=None):
+        """Create an empty doubly linked list, optionally recycling nodes through a NodePool"""
+        self._pool = pool
+        self._index = None
+        self._ranks = None
         self._header = self._Node(None, None, None)
         self._trailer = self._Node(None, None, None)
         self._header._next = self._trailer
@@ -30,12 +39,12 @@ class _DoublyLinkedBase:
         if self.is_empty():
             return ""
 
-        curr = self._header._next
-        retstr = str(curr._element)
+        curr = self._next_of(self._header)
+        retstr = str(self._element_of(curr))
 
-        while curr._next is not self._trailer:
-            retstr += "->" + str(curr._next._element)
-            curr = curr._next
+        while self._next_of(curr) != self._trailer:
+            curr = self._next_of(curr)
+            retstr += "->" + str(self._element_of(curr))
 
         return retstr
 
@@ -43,13 +52,140 @@ class _DoublyLinkedBase:
         """Return True if list is empty"""
         return self._size == 0
 
+    def enable_index(self):
+        """Maintain a hash index from element to nodes so lookups by value take O(1) time
+
+        Elements must be hashable while the index is enabled.
+        """
+        self._index = {}
+        for node in self._iter_nodes():
+            self._index_add(self._element_of(node), node)
+
+    def disable_index(self):
+        """Stop maintaining the element index"""
+        self._index = None
+
+    def _index_add(self, e, node):
+        """Record that node holds element e"""
+        nodes = self._index.get(e)
+        if nodes is None:
+            self._index[e] = {node}
+        else:
+            nodes.add(node)
+
+    def _index_discard(self, e, node):
+        """Forget that node holds element e"""
+        nodes = self._index[e]
+        nodes.discard(node)
+        if not nodes:
+            del self._index[e]
+
+    def _find_node(self, e):
+        """Return the first node holding element e, or None if there is none"""
+        if self._index is not None:
+            nodes = self._index.get(e)
+            if nodes is None:
+                return None
+            if len(nodes) == 1:
+                return next(iter(nodes))
+            for node in self._iter_nodes():
+                if node in nodes:
+                    return node
+
+        for node in self._iter_nodes():
+            if self._element_of(node) == e:
+                return node
+        return None
+
+    def enable_rank_index(self):
+        """Maintain an indexable skip list over the nodes so rank queries take O(log n) time
+
+        Inserting or deleting a node then costs O(log n) expected time.
+        """
+        self._ranks = RankedSkipList()
+        prev = None
+        for node in self._iter_nodes():
+            self._ranks.insert_after(prev, node)
+            prev = node
+
+    def disable_rank_index(self):
+        """Stop maintaining the rank index"""
+        self._ranks = None
+
+    def _rank_add(self, predecessor, node):
+        """Record node in the rank index right after predecessor"""
+        self._ranks.insert_after(None if predecessor == self._header else predecessor, node)
+
+    def _node_at(self, k):
+        """Return the node of rank k, where a negative k counts from the back"""
+        if k < 0:
+            k += self._size
+        if not 0 <= k < self._size:
+            raise IndexError("list index out of range")
+        if self._ranks is not None:
+            return self._ranks.select(k)
+
+        if k < self._size // 2:
+            node = self._next_of(self._header)
+            for i in range(k):
+                node = self._next_of(node)
+        else:
+            node = self._prev_of(self._trailer)
+            for i in range(self._size - 1 - k):
+                node = self._prev_of(node)
+        return node
+
+    def _rank_of(self, node):
+        """Return the number of nodes before node"""
+        if self._ranks is not None:
+            return self._ranks.rank(node)
+
+        rank = 0
+        node = self._prev_of(node)
+        while node != self._header:
+            node = self._prev_of(node)
+            rank += 1
+        return rank
+
+    # ------- node primitives, overridden by other list representations ------- #
+    def _next_of(self, node):
+        """Return the node following node"""
+        return node._next
+
+    def _prev_of(self, node):
+        """Return the node preceding node"""
+        return node._prev
+
+    def _element_of(self, node):
+        """Return the element stored at node"""
+        return node._element
+
+    def _set_element(self, node, e):
+        """Store element e at node"""
+        if self._index is not None:
+            self._index_discard(node._element, node)
+            self._index_add(e, node)
+        node._element = e
+
+    def _is_live(self, node):
+        """Return True if node has not been deleted from the list"""
+        return node._next is not None
+
     def _insert_between(self, e, predecessor, successor):
         """Insert e between two existing nodes and return new node"""
-        newest = self._Node(e, predecessor, successor)
+        newest = self._pool.get() if self._pool is not None else None
+        if newest is None:
+            newest = self._Node(e, predecessor, successor)
+        else:
+            newest._element, newest._prev, newest._next = e, predecessor, successor
         predecessor._next = newest
         successor._prev = newest
         self._size += 1
 
+        if self._index is not None:
+            self._index_add(e, newest)
+        if self._ranks is not None:
+            self._rank_add(predecessor, newest)
         return newest
 
     def _delete_node(self, node):
@@ -65,99 +201,414 @@ class _DoublyLinkedBase:
         successor._prev = predecessor
 
         elem = node._element
+        if self._index is not None:
+            self._index_discard(elem, node)
+        if self._ranks is not None:
+            self._ranks.remove(node)
         node._prev = node._next = node._element = None
+        if self._pool is not None:
+            self._pool.put(node)
 
         self._size -= 1
 
         return elem
 
+    def _iter_nodes(self, reverse=False, start=None):
+        """Generate the nonsentinel nodes of the list from front to back (or back to front)
+
+        If start is a nonsentinel node, generation begins there instead.
+        """
+        if reverse:
+            node = self._trailer._prev if start is None else start
+            while node is not self._header:
+                yield node
+                node = node._prev
+        else:
+            node = self._header._next if start is None else start
+            while node is not self._trailer:
+                yield node
+                node = node._next
+
+    def _iter_elements(self, reverse=False):
+        """Generate the elements of the list from front to back (or back to front)"""
+        if reverse:
+            node = self._trailer._prev
+            while node is not self._header:
+                yield node._element
+                node = node._prev
+        else:
+            node = self._header._next
+            while node is not self._trailer:
+                yield node._element
+                node = node._next
+
+    def _extend_last(self, elements):
+        """Append every element of an iterable, linking the new nodes in one pass"""
+        Node = self._Node
+        start = last = self._trailer._prev
+        count = 0
+        for e in elements:
+            newest = Node(e, last, None)
+            last._next = newest
+            last = newest
+            count += 1
+        last._next = self._trailer
+        self._trailer._prev = last
+        self._size += count
+
+        if self._index is not None or self._ranks is not None:
+            node = start._next
+            while node is not self._trailer:
+                if self._index is not None:
+                    self._index_add(node._element, node)
+                if self._ranks is not None:
+                    self._rank_add(node._prev, node)
+                node = node._next
+
+    def _splice_last(self, other):
+        """Move every node of other, a list of the same representation, to the back in O(1)"""
+        if self._index is not None:
+            for node in other._iter_nodes():
+                self._index_add(node._element, node)
+        if self._ranks is not None:
+            prev = self._trailer._prev
+            for node in other._iter_nodes():
+                self._rank_add(prev, node)
+                prev = node
+
+        first = other._header._next
+        last = other._trailer._prev
+        tail = self._trailer._prev
+
+        tail._next = first
+        first._prev = tail
+        last._next = self._trailer
+        self._trailer._prev = last
+        self._size += other._size
+
+        other._clear()
+
+    def _clear(self):
+        """Drop every element, leaving only the sentinels"""
+        self._header._next = self._trailer
+        self._trailer._prev = self._header
+        self._size = 0
+        if self._index is not None:
+            self._index = {}
+        if self._ranks is not None:
+            self._ranks = RankedSkipList()
+
+    def _move_after(self, node, predecessor):
+        """Unlink nonsentinel node and link it again right after predecessor, in O(1)"""
+        node._prev._next = node._next
+        node._next._prev = node._prev
+        successor = predecessor._next
+        node._prev = predecessor
+        node._next = successor
+        predecessor._next = node
+        successor._prev = node
+
+        if self._ranks is not None:
+            self._ranks.remove(node)
+            self._rank_add(predecessor, node)
+
+    def _relink(self, nodes):
+        """Link the nodes of a sequence holding every nonsentinel node, in its order"""
+        prev = self._header
+        for node in nodes:
+            prev._next = node
+            node._prev = prev
+            prev = node
+        prev._next = self._trailer
+        self._trailer._prev = prev
+
+        if self._ranks is not None:
+            self.enable_rank_index()
+
+
+class _ArrayLinkedBase(_DoublyLinkedBase):
+    """A doubly linked list representation storing elements and links in parallel arrays
+
+    A node is the index of its slot. The links live in typed arrays, so no
+    Python object is allocated per element. Deleted slots are chained through
+    _next into a free-list and reused by later insertions.
+    """
+    _FREED = -2                      # _prev marker of a slot on the free-list
+
+    def __init__(self):
+        """Create an empty doubly linked list"""
+        self._pool = None
+        self._index = None
+        self._ranks = None
+        self._header = 0
+        self._trailer = 1
+        self._elements = [None, None]
+        self._prev = array.array('i', [-1, 0])
+        self._next = array.array('i', [1, -1])
+        self._generation = array.array('I', [0, 0])
+        self._free = -1
+        self._size = 0
+
+    def _next_of(self, node):
+        """Return the node following node"""
+        return self._next[node]
+
+    def _prev_of(self, node):
+        """Return the node preceding node"""
+        return self._prev[node]
+
+    def _element_of(self, node):
+        """Return the element stored at node"""
+        return self._elements[node]
+
+    def _set_element(self, node, e):
+        """Store element e at node"""
+        if self._index is not None:
+            self._index_discard(self._elements[node], node)
+            self._index_add(e, node)
+        self._elements[node] = e
+
+    def _is_live(self, node):
+        """Return True if node has not been deleted from the list"""
+        return self._prev[node] != self._FREED
+
+    def _insert_between(self, e, predecessor, successor):
+        """Insert e between two existing nodes and return new node"""
+        newest = self._free
+        if newest == -1:
+            newest = len(self._elements)
+            self._elements.append(e)
+            self._prev.append(predecessor)
+            self._next.append(successor)
+            self._generation.append(0)
+        else:
+            self._free = self._next[newest]
+            self._elements[newest] = e
+            self._prev[newest] = predecessor
+            self._next[newest] = successor
+        self._next[predecessor] = newest
+        self._prev[successor] = newest
+        self._size += 1
+
+        if self._index is not None:
+            self._index_add(e, newest)
+        if self._ranks is not None:
+            self._rank_add(predecessor, newest)
+        return newest
+
+    def _delete_node(self, node):
+        """Delete nonsentinel node from the list and return its element"""
+
+        if self.is_empty():
+            raise Empty("List is empty!")
+
+        predecessor = self._prev[node]
+        successor = self._next[node]
+
+        self._next[predecessor] = successor
+        self._prev[successor] = predecessor
+
+        elem = self._elements[node]
+        if self._index is not None:
+            self._index_discard(elem, node)
+        if self._ranks is not None:
+            self._ranks.remove(node)
+        self._elements[node] = None
+        self._prev[node] = self._FREED
+        self._next[node] = self._free
+        self._free = node
+        self._generation[node] = (self._generation[node] + 1) & 0xFFFFFFFF
+
+        self._size -= 1
+
+        return elem
+
+    def _iter_nodes(self, reverse=False, start=None):
+        """Generate the nonsentinel nodes of the list from front to back (or back to front)
+
+        If start is a nonsentinel node, generation begins there instead.
+        """
+        if reverse:
+            links, node, end = self._prev, self._prev[self._trailer], self._header
+        else:
+            links, node, end = self._next, self._next[self._header], self._trailer
+        if start is not None:
+            node = start
+        while node != end:
+            yield node
+            node = links[node]
+
+    def _iter_elements(self, reverse=False):
+        """Generate the elements of the list from front to back (or back to front)"""
+        elements = self._elements
+        if reverse:
+            links, node, end = self._prev, self._prev[self._trailer], self._header
+        else:
+            links, node, end = self._next, self._next[self._header], self._trailer
+        while node != end:
+            yield elements[node]
+            node = links[node]
+
+    def _extend_last(self, elements):
+        """Append every element of an iterable as a run of new slots"""
+        elements = list(elements)
+        n = len(elements)
+        if n == 0:
+            return
+        first = len(self._elements)
+        last = self._prev[self._trailer]
+
+        self._elements.extend(elements)
+        self._prev.append(last)
+        self._prev.extend(range(first, first + n - 1))
+        self._next.extend(range(first + 1, first + n))
+        self._next.append(self._trailer)
+        self._generation.extend(array.array('I', [0]) * n)
+
+        self._next[last] = first
+        self._prev[self._trailer] = first + n - 1
+        self._size += n
+
+        if self._index is not None:
+            for node, e in enumerate(elements, first):
+                self._index_add(e, node)
+        if self._ranks is not None:
+            for node in range(first, first + n):
+                self._rank_add(self._prev[node], node)
+
+    def _clear(self):
+        """Drop every element and release the slot storage"""
+        indexed = self._index is not None
+        ranked = self._ranks is not None
+        _ArrayLinkedBase.__init__(self)
+        if indexed:
+            self._index = {}
+        if ranked:
+            self._ranks = RankedSkipList()
+
+    def _move_after(self, node, predecessor):
+        """Unlink nonsentinel node and link it again right after predecessor, in O(1)"""
+        forward = self._next
+        backward = self._prev
+        forward[backward[node]] = forward[node]
+        backward[forward[node]] = backward[node]
+        successor = forward[predecessor]
+        backward[node] = predecessor
+        forward[node] = successor
+        forward[predecessor] = node
+        backward[successor] = node
+
+        if self._ranks is not None:
+            self._ranks.remove(node)
+            self._rank_add(predecessor, node)
+
+    def _relink(self, nodes):
+        """Link the nodes of a sequence holding every nonsentinel node, in its order"""
+        successor = self._next
+        predecessor = self._prev
+        prev = self._header
+        for node in nodes:
+            successor[prev] = node
+            predecessor[node] = prev
+            prev = node
+        successor[prev] = self._trailer
+        predecessor[self._trailer] = prev
+
+        if self._ranks is not None:
+            self.enable_rank_index()
+
 
 class LinkedDeque(_DoublyLinkedBase):
     """Double-ended queue implementation based on a doubly linked list"""
+    _INSTRUMENTED = ('insert_first', 'insert_last', 'delete_first', 'delete_last',
+                     'first', 'last', 'extend_splice')
+    _SEARCHES = ('swap_nodes',)
 
     def __add__(self, other):
+        """Return a new deque holding the elements of self followed by those of other"""
         if not isinstance(other, LinkedDeque):
             raise TypeError("Not a doubly linked list")
 
-        new = LinkedDeque()
-        if self.is_empty() and other.is_empty():
-            return new
+        new = type(self)()
+        new._extend_last(self._iter_elements())
+        new._extend_last(other._iter_elements())
+        return new
+
+    def __iadd__(self, other):
+        """Splice the elements of other onto the back of self, leaving other empty"""
+        self.extend_splice(other)
+        return self
 
-        currA = self._trailer._prev
-        currB = other._header._next
+    def extend_splice(self, other):
+        """Move the elements of other to the back of the deque, leaving other empty
 
-        while currA != self._header:
-            new.insert_first(currA._element)
-            currA = currA._prev
+        Runs in O(1) time when both deques link node objects. When either one
+        is array-backed, the elements are copied over in one pass instead.
+        """
+        if not isinstance(other, LinkedDeque):
+            raise TypeError("Not a doubly linked list")
+        if other is self:
+            raise ValueError("Cannot splice a deque onto itself")
+        if other.is_empty():
+            return
 
-        while currB != other._trailer:
-            new.insert_last(currB._element)
-            currB = currB._next
+        if isinstance(self, _ArrayLinkedBase) or isinstance(other, _ArrayLinkedBase):
+            self._extend_last(other._iter_elements())
+            other._clear()
+        else:
+            self._splice_last(other)
 
-        return new
+    def __getitem__(self, k):
+        """Return the element at index k, in O(log n) time once the rank index is enabled"""
+        return self._element_of(self._node_at(k))
 
     def first(self):
         """Return (but do not delete) the first element in the deque"""
         if self.is_empty():
             raise Empty("List is empty!")
-        return self._header._next._element
+        return self._element_of(self._next_of(self._header))
 
     def last(self):
         """Return (but do not delete) the last element in the deque"""
         if self.is_empty():
-            raise Emtpy("List is empty!")
-        return self._trailer._prev._element
+            raise Empty("List is empty!")
+        return self._element_of(self._prev_of(self._trailer))
 
     def insert_first(self, e):
         """Insert e into the front of the list"""
-        self._insert_between(e, self._header, self._header._next)
+        self._insert_between(e, self._header, self._next_of(self._header))
 
     def insert_last(self, e):
         """Insert e at the back of the list"""
-        self._insert_between(e, self._trailer._prev, self._trailer)
+        self._insert_between(e, self._prev_of(self._trailer), self._trailer)
 
     def delete_first(self):
         """Delete and return the element from the front of the queue"""
         if self.is_empty():
             raise Empty("List is empty")
-        return self._delete_node(self._header._next)
+        return self._delete_node(self._next_of(self._header))
 
     def delete_last(self):
-        """Delete and return the elemetn at the back of the queue"""
+        """Delete and return the element at the back of the queue"""
         if self.is_empty():
             raise Empty("List is empty")
-        return self._delete_node(self.trailer._prev)
+        return self._delete_node(self._prev_of(self._trailer))
 
     def swap_nodes(self, a, b):
-        """Swap nodes a and b"""
+        """Swap the first nodes holding elements a and b"""
         if a == b:
             return
         if len(self) < 2:
             return
 
-        nodeA = nodeB = None
-        curr_node = self._header
+        nodeA = self._find_node(a)
+        nodeB = self._find_node(b)
 
-        while curr_node is not None and not (nodeA and nodeB):
-            if curr_node._element == a and not nodeA:
-                nodeA = curr_node
-            elif curr_node._element == b and not nodeB:
-                nodeB = curr_node
-            curr_node = curr_node._next
-
-        if curr_node is None:
+        if nodeA is None or nodeB is None:
             raise Empty("Not in list")
 
-        precessorA = nodeA._prev
-        successorA = nodeA._next
-        precessorB = nodeB._prev
-        successorB = nodeB._next
-
-        precessorA._next = successorA._prev = nodeB
-        precessorB._next = successorB._prev = nodeA
-
-        nodeA._prev, nodeB._prev = nodeB._prev, nodeA._prev
-        nodeA._next, nodeB._next = nodeB._next, nodeA._next
+        self._set_element(nodeA, b)
+        self._set_element(nodeB, a)
 
     def link_hopping(self):
         """Find the center node by link hopping
@@ -172,16 +623,170 @@ class LinkedDeque(_DoublyLinkedBase):
 
         fast = slow = self._header
 
-        while fast is not None:
-            fast = fast._next
-            if fast is not None and fast != self._trailer:
-                fast = fast._next
-                slow = slow._next
-        return slow._element
+        while fast != self._trailer:
+            fast = self._next_of(fast)
+            if fast != self._trailer:
+                fast = self._next_of(fast)
+                slow = self._next_of(slow)
+        return self._element_of(slow)
+
+
+class ArrayLinkedDeque(LinkedDeque, _ArrayLinkedBase):
+    """Double-ended queue implementation based on an array-backed doubly linked list"""
+
+
+class UnrolledLinkedDeque:
+    """Double-ended queue implementation based on an unrolled doubly linked list
+
+    Each node stores a fixed-size block of up to block_size elements, so
+    walking the deque follows one link per block instead of one per element.
+    """
+    DEFAULT_BLOCK_SIZE = 64
+
+    class _Block:
+        """Lightweight, nonpublic class for storing a run of elements."""
+        __slots__ = '_elements', '_start', '_end', '_prev', '_next'
+
+        def __init__(self, size, offset, prev, next):
+            self._elements = [None] * size
+            self._start = self._end = offset
+            self._prev = prev
+            self._next = next
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        """Create an empty deque"""
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self._block_size = block_size
+        self._header = self._Block(0, 0, None, None)
+        self._trailer = self._Block(0, 0, self._header, None)
+        self._header._next = self._trailer
+        self._size = 0
+
+    def __len__(self):
+        """Return the number of elements in the deque"""
+        return self._size
+
+    def __str__(self):
+        return "->".join(str(e) for e in self)
+
+    def __iter__(self):
+        """Generate a forward iteration of the elements in the deque"""
+        block = self._header._next
+        while block is not self._trailer:
+            yield from block._elements[block._start:block._end]
+            block = block._next
+
+    def __reversed__(self):
+        """Generate a backward iteration of the elements in the deque"""
+        block = self._trailer._prev
+        while block is not self._header:
+            yield from reversed(block._elements[block._start:block._end])
+            block = block._prev
+
+    def __add__(self, other):
+        if not isinstance(other, UnrolledLinkedDeque):
+            raise TypeError("Not an unrolled linked list")
+
+        new = type(self)(self._block_size)
+        new._append_all(self)
+        new._append_all(other)
+        return new
+
+    def is_empty(self):
+        """Return True if deque is empty"""
+        return self._size == 0
+
+    def _add_block(self, offset, predecessor, successor):
+        """Link a new empty block between two existing blocks and return it"""
+        block = self._Block(self._block_size, offset, predecessor, successor)
+        predecessor._next = block
+        successor._prev = block
+        return block
+
+    def _remove_block(self, block):
+        """Unlink an emptied block"""
+        block._prev._next = block._next
+        block._next._prev = block._prev
+        block._prev = block._next = None
+
+    def _append_all(self, elements):
+        """Insert every element of an iterable at the back, a block slice at a time"""
+        size = self._block_size
+        elements = list(elements)
+        k = 0
+        while k < len(elements):
+            block = self._trailer._prev
+            if block is self._header or block._end == size:
+                block = self._add_block(0, block, self._trailer)
+            n = min(size - block._end, len(elements) - k)
+            block._elements[block._end:block._end + n] = elements[k:k + n]
+            block._end += n
+            k += n
+        self._size += len(elements)
+
+    def first(self):
+        """Return (but do not delete) the first element in the deque"""
+        if self.is_empty():
+            raise Empty("List is empty!")
+        block = self._header._next
+        return block._elements[block._start]
+
+    def last(self):
+        """Return (but do not delete) the last element in the deque"""
+        if self.is_empty():
+            raise Empty("List is empty!")
+        block = self._trailer._prev
+        return block._elements[block._end - 1]
+
+    def insert_first(self, e):
+        """Insert e into the front of the deque"""
+        block = self._header._next
+        if block is self._trailer or block._start == 0:
+            block = self._add_block(self._block_size, self._header, block)
+        block._start -= 1
+        block._elements[block._start] = e
+        self._size += 1
+
+    def insert_last(self, e):
+        """Insert e at the back of the deque"""
+        block = self._trailer._prev
+        if block is self._header or block._end == self._block_size:
+            block = self._add_block(0, block, self._trailer)
+        block._elements[block._end] = e
+        block._end += 1
+        self._size += 1
+
+    def delete_first(self):
+        """Delete and return the element from the front of the deque"""
+        if self.is_empty():
+            raise Empty("List is empty")
+        block = self._header._next
+        elem = block._elements[block._start]
+        block._elements[block._start] = None
+        block._start += 1
+        if block._start == block._end:
+            self._remove_block(block)
+        self._size -= 1
+        return elem
+
+    def delete_last(self):
+        """Delete and return the element at the back of the deque"""
+        if self.is_empty():
+            raise Empty("List is empty")
+        block = self._trailer._prev
+        block._end -= 1
+        elem = block._elements[block._end]
+        block._elements[block._end] = None
+        if block._start == block._end:
+            self._remove_block(block)
+        self._size -= 1
+        return elem
 
 
 if __name__ == '__main__':
     import unittest
+    from nodePool import NodePool
 
     class TestDLL(unittest.TestCase):
         def setUp(self):
@@ -205,6 +810,69 @@ if __name__ == '__main__':
             dll3 = self.dll + dll2
 
             self.assertTrue(dll3.first() == 9 and dll3.last() == 0)
+            self.assertTrue(str(dll3) == "9->8->7->6->5->4->3->2->1->0->4->3->2->1->0")
+
+        def test_splice(self):
+            other = type(self.dll)()
+            self.dll += other
+            self.assertTrue(self.dll.is_empty())
+            for i in range(3):
+                self.dll.insert_last(i)
+                other.insert_last(i + 3)
+            self.dll += other
+            self.assertTrue(other.is_empty() and len(self.dll) == 6)
+            self.assertTrue(str(self.dll) == "0->1->2->3->4->5")
+            other.insert_last(6)
+            self.assertTrue(other.first() == 6 and other.last() == 6)
+            self.dll.extend_splice(other)
+            self.assertTrue(self.dll.delete_last() == 6 and self.dll.last() == 5)
+            with self.assertRaises(ValueError):
+                self.dll.extend_splice(self.dll)
+
+        def test_getitem(self):
+            with self.assertRaises(IndexError):
+                self.dll[0]
+            for i in range(10):
+                self.dll.insert_last(i)
+            self.assertTrue([self.dll[k] for k in range(10)] == list(range(10)))
+            self.assertTrue(self.dll[-1] == 9 and self.dll[-10] == 0)
+            self.dll.enable_rank_index()
+            self.dll.insert_first(-1)
+            self.dll.delete_last()
+            other = type(self.dll)()
+            other.insert_last(20)
+            self.dll += other
+            self.assertTrue([self.dll[k] for k in range(11)] == list(range(-1, 9)) + [20])
+            with self.assertRaises(IndexError):
+                self.dll[11]
+
+        def test_index(self):
+            for i in range(5):
+                self.dll.insert_last(i)
+            self.dll.enable_index()
+            self.dll.insert_first(4)
+            self.dll.swap_nodes(4, 0)
+            self.assertTrue(str(self.dll) == "0->4->1->2->3->4")
+            self.dll.delete_first()
+            self.dll.delete_last()
+            self.dll.insert_last(5)
+            other = type(self.dll)()
+            other.insert_last(7)
+            self.dll += other
+            self.assertTrue(sorted(self.dll._index) == [1, 2, 3, 4, 5, 7])
+            with self.assertRaises(Empty):
+                self.dll.swap_nodes(0, 7)
+            self.dll.swap_nodes(7, 1)
+            self.assertTrue(str(self.dll) == "4->7->2->3->5->1")
+
+        def test_splice_mixed_backends(self):
+            other = ArrayLinkedDeque() if type(self.dll) is LinkedDeque else LinkedDeque()
+            for i in range(3):
+                self.dll.insert_last(i)
+                other.insert_last(i + 3)
+            self.dll.extend_splice(other)
+            self.assertTrue(other.is_empty())
+            self.assertTrue(str(self.dll) == "0->1->2->3->4->5")
 
 
         def test_find_middle(self):
@@ -239,4 +907,64 @@ if __name__ == '__main__':
             self.assertTrue(self.dll.first() == 5)
             self.assertTrue(self.dll.last() == 3)
 
+        def test_node_pool(self):
+            pool = NodePool(1)
+            self.dll = LinkedDeque(pool)
+            self.dll.insert_first(1)
+            self.dll.insert_first(2)
+            self.assertTrue(self.dll.delete_first() == 2)
+            self.assertTrue(self.dll.delete_first() == 1)
+            self.dll.insert_last(3)
+            self.assertTrue(self.dll.first() == 3)
+            self.assertTrue(pool.stats() == {'hits': 1, 'misses': 2, 'size': 0, 'capacity': 1})
+
+    class TestArrayDLL(TestDLL):
+        def setUp(self):
+            self.dll = ArrayLinkedDeque()
+
+        @unittest.skip("array-backed lists have no node objects to pool")
+        def test_node_pool(self):
+            pass
+
+        def test_reuse_slots(self):
+            for i in range(5):
+                self.dll.insert_last(i)
+            self.assertTrue(self.dll.delete_first() == 0)
+            self.assertTrue(self.dll.delete_last() == 4)
+            self.dll.insert_first(10)
+            self.dll.insert_last(11)
+            self.assertTrue(len(self.dll._elements) == 7)
+            self.assertTrue(str(self.dll) == "10->1->2->3->11")
+
+    class TestUnrolledDeque(unittest.TestCase):
+        def setUp(self):
+            self.dq = UnrolledLinkedDeque(4)
+
+        def test_ends(self):
+            with self.assertRaises(Empty):
+                self.dq.first()
+            for i in range(10):
+                self.dq.insert_last(i)
+                self.dq.insert_first(-i)
+            self.assertTrue(self.dq.first() == -9 and self.dq.last() == 9)
+            self.assertTrue(list(self.dq) == list(range(-9, 1)) + list(range(10)))
+            self.assertTrue(list(reversed(self.dq)) == list(reversed(list(self.dq))))
+            for i in range(9, -1, -1):
+                self.assertTrue(self.dq.delete_last() == i)
+            for i in range(9, 0, -1):
+                self.assertTrue(self.dq.delete_first() == -i)
+            self.assertTrue(self.dq.delete_first() == 0)
+            self.assertTrue(self.dq.is_empty())
+            self.assertTrue(self.dq._header._next is self.dq._trailer)
+
+        def test_add(self):
+            other = UnrolledLinkedDeque(4)
+            self.assertTrue((self.dq + other).is_empty())
+            for i in range(6):
+                self.dq.insert_first(i)
+                other.insert_last(i)
+            both = self.dq + other
+            self.assertTrue(len(both) == 12)
+            self.assertTrue(str(both) == "5->4->3->2->1->0->0->1->2->3->4->5")
+
     unittest.main()
\ No newline at end of file
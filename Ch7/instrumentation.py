@@ -0,0 +1,207 @@
+import collections
+import time
+
+
+class _Record:
+    """Lightweight, nonpublic class for the counters of one instrumented container."""
+
+    def __init__(self, timing):
+        self.timing = timing
+        self.operations = collections.Counter()
+        self.high_water = 0
+        self.resizes = 0
+        self.traversed = 0
+        self.searches = 0
+        self.search_nodes = 0
+        self.search_max = 0
+        self.search_histogram = collections.Counter()
+        self.timings = collections.defaultdict(collections.Counter)
+
+
+class Instrumented:
+    """Mixin giving a container opt-in operation counters and a stats() snapshot
+
+    enable_instrumentation() stores wrapped versions of the methods named in
+    _INSTRUMENTED, _SEARCHES and _RESIZES as instance attributes, shadowing
+    the class methods; disable_instrumentation() deletes them again. The
+    methods of a container that was never instrumented are untouched, so
+    there is no cost when it is disabled. Searches count the nodes yielded
+    by the container's _iter_nodes generator while they run.
+
+    Histograms map an upper bound (a power of two) to the number of samples
+    at most that large; timings are in nanoseconds.
+    """
+    _INSTRUMENTED = ()
+    _SEARCHES = ()
+    _RESIZES = ()
+
+    def enable_instrumentation(self, timing=False):
+        """Start counting operations, also timing each one if timing is True"""
+        self.disable_instrumentation()
+        record = self._instrumentation = _Record(timing)
+        cls = type(self)
+        for name in self._INSTRUMENTED:
+            if hasattr(cls, name):
+                setattr(self, name, self._wrap_counted(name, getattr(self, name), record))
+        for name in self._SEARCHES:
+            if hasattr(cls, name):
+                setattr(self, name, self._wrap_search(self._wrap_counted(name, getattr(self, name), record), record))
+        for name in self._RESIZES:
+            if hasattr(cls, name):
+                setattr(self, name, self._wrap_resize(getattr(self, name), record))
+        if self._SEARCHES and hasattr(cls, '_iter_nodes'):
+            self._iter_nodes = self._wrap_traversal(self._iter_nodes, record)
+
+    def disable_instrumentation(self):
+        """Restore the plain methods, keeping the counters gathered so far for stats()"""
+        wrapped = self.__dict__
+        for name in self._INSTRUMENTED + self._SEARCHES + self._RESIZES + ('_iter_nodes',):
+            wrapped.pop(name, None)
+
+    def stats(self):
+        """Return a snapshot of the counters, or None if instrumentation was never enabled"""
+        record = self.__dict__.get('_instrumentation')
+        if record is None:
+            return None
+        return {
+            'operations': dict(record.operations),
+            'size': self._size,
+            'high_water': record.high_water,
+            'resizes': record.resizes,
+            'searches': {'count': record.searches, 'nodes': record.search_nodes,
+                         'max_nodes': record.search_max,
+                         'histogram': self._histogram(record.search_histogram)},
+            'timings': ({name: self._histogram(h) for name, h in record.timings.items()}
+                        if record.timing else None),
+        }
+
+    @staticmethod
+    def _histogram(counter):
+        return {(1 << bucket) - 1 if bucket else 0: counter[bucket] for bucket in sorted(counter)}
+
+    def _wrap_counted(self, name, method, record):
+        """Return method counting its calls, the size high-water mark and, optionally, its time"""
+        operations = record.operations
+
+        def counted(*args, **kwargs):
+            operations[name] += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if self._size > record.high_water:
+                    record.high_water = self._size
+
+        if not record.timing:
+            return counted
+
+        histogram = record.timings[name]
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return counted(*args, **kwargs)
+            finally:
+                histogram[(clock() - start).bit_length()] += 1
+
+        return timed
+
+    @staticmethod
+    def _wrap_search(method, record):
+        """Return method recording how many nodes each call traverses"""
+        def search(*args, **kwargs):
+            before = record.traversed
+            try:
+                return method(*args, **kwargs)
+            finally:
+                nodes = record.traversed - before
+                record.searches += 1
+                record.search_nodes += nodes
+                record.search_max = max(record.search_max, nodes)
+                record.search_histogram[nodes.bit_length()] += 1
+        return search
+
+    @staticmethod
+    def _wrap_resize(method, record):
+        """Return method counting how often the container's storage is reallocated"""
+        def resize(*args, **kwargs):
+            record.resizes += 1
+            return method(*args, **kwargs)
+        return resize
+
+    @staticmethod
+    def _wrap_traversal(iter_nodes, record):
+        """Return iter_nodes counting every node it yields"""
+        def traversal(*args, **kwargs):
+            for node in iter_nodes(*args, **kwargs):
+                record.traversed += 1
+                yield node
+        return traversal
+
+
+if __name__ == '__main__':
+    import unittest
+
+    from arrayQueue import ArrayQueue
+    from circularlyLinkedList import CircularQueue
+    from doubleLinkedList import LinkedDeque
+    from positionalList import PositionalList
+    from singlyLinkedLists import LinkedStack
+
+    class TestInstrumented(unittest.TestCase):
+
+        def test_disabled(self):
+            q = ArrayQueue()
+            self.assertIsNone(q.stats())
+            self.assertTrue('enqueue' not in vars(q))
+            q.enable_instrumentation()
+            q.enqueue(1)
+            q.disable_instrumentation()
+            q.enqueue(2)
+            self.assertTrue('enqueue' not in vars(q) and q.stats()['operations'] == {'enqueue': 1})
+
+        def test_counters(self):
+            q = ArrayQueue()
+            q.enable_instrumentation(timing=True)
+            for i in range(50):
+                q.enqueue(i)
+            q.dequeue_many(45)
+            stats = q.stats()
+            self.assertTrue(stats['operations'] == {'enqueue': 50, 'dequeue_many': 1})
+            self.assertTrue(stats['high_water'] == 50 and stats['size'] == 5)
+            self.assertTrue(stats['resizes'] == 3 + 1)
+            self.assertTrue(sum(stats['timings']['enqueue'].values()) == 50)
+
+        def test_searches(self):
+            L = PositionalList()
+            L.enable_instrumentation()
+            for i in range(10):
+                L.add_last(i)
+            L.find(6)
+            L.find(42)
+            stats = L.stats()
+            self.assertTrue(stats['searches']['count'] == 2 and stats['searches']['nodes'] == 17)
+            self.assertTrue(stats['searches']['max_nodes'] == 10 and stats['operations']['add_last'] == 10)
+
+            d = LinkedDeque()
+            d.enable_instrumentation()
+            for i in range(5):
+                d.insert_last(i)
+            d.swap_nodes(1, 3)
+            self.assertTrue(d.stats()['searches']['nodes'] == 2 + 4)
+
+            q = CircularQueue()
+            q.enable_instrumentation()
+            q.enqueue_many('abcde')
+            q.get_Node('c')
+            self.assertTrue(q.stats()['searches']['nodes'] == 3)
+
+        def test_stack(self):
+            s = LinkedStack()
+            s.enable_instrumentation()
+            for i in range(3):
+                s.push(i)
+            s.pop()
+            self.assertTrue(s.stats()['high_water'] == 3 and s.stats()['size'] == 2)
+
+    unittest.main()
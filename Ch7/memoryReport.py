@@ -0,0 +1,232 @@
+import gc
+import sys
+import tracemalloc
+import types
+
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj, seen=None):
+    """Return the bytes of obj and every object reachable from it that is not in seen
+
+    Classes, modules and functions are not counted. seen is a set of ids,
+    updated in place, so several calls can share it to avoid double counting.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return total
+
+
+def _layout(container):
+    """Return (nodes, storage, elements, slots, sentinels) for the representation used by container
+
+    nodes are the linked node (or block) objects including sentinels,
+    storage the arrays or lists holding slots, and elements the stored
+    references.
+    slots counts every node or storage slot, sentinels those reserved for
+    sentinels; the rest beyond the elements are free.
+    """
+    if hasattr(container, '_elements') and hasattr(container, '_generation'):
+        storage = [container._elements, container._prev, container._next, container._generation]
+        elements = [container._element_of(node) for node in container._iter_nodes()]
+        return [], storage, elements, len(container._elements), 2
+    if hasattr(container, '_data'):
+        return [], [container._data], list(container), len(container._data), 0
+    if hasattr(container, '_block_size'):
+        blocks = []
+        block = container._header
+        while block is not None:
+            blocks.append(block)
+            block = block._next
+        storage = [block._elements for block in blocks]
+        return blocks, storage, list(container), sum(len(slots) for slots in storage), 0
+
+    nodes = []
+    first = 0
+    if hasattr(container, '_header'):
+        node = container._header
+        first = 1
+        while node is not None:
+            nodes.append(node)
+            node = node._next
+    elif hasattr(container, '_head'):
+        node = container._head
+        while node is not None:
+            nodes.append(node)
+            node = node._next
+    elif container._size:
+        node = container._tail.next
+        for k in range(container._size):
+            nodes.append(node)
+            node = node.next
+    real = nodes[first:first + container._size]
+    elements = [node._element if hasattr(node, '_element') else node._data for node in real]
+    return nodes, [], elements, len(nodes), len(nodes) - container._size
+
+
+def memory_report(container, workload=None, top=10):
+    """Return a dictionary describing the memory used by a Ch7 container
+
+    The container's internal node chain (or slot arrays) is walked to count
+    nodes (or slots, including free ones), sentinels among them, and to
+    measure them:
+
+      shallow_bytes   the container object plus its nodes or slot storage
+      element_bytes   everything reachable from the stored elements
+      auxiliary_bytes indexes, aggregates, pools and counters it owns
+      list_bytes      a plain list holding the same element references
+      overhead_ratio  shallow_bytes / list_bytes
+
+    For a PositionalList, position_bytes is the cost of each Position handed
+    out. If workload is given, workload(container) first runs under
+    tracemalloc, the report gets a 'tracemalloc' entry with the net change
+    and the top allocation sites by size difference, and the container is
+    measured as the workload left it.
+    """
+    diff = None
+    if workload is not None:
+        diff = tracemalloc_diff(lambda: workload(container), top)
+
+    nodes, storage, elements, slots, sentinels = _layout(container)
+    size = container._size
+
+    seen = {id(container)}
+    own = sys.getsizeof(container) + sys.getsizeof(container.__dict__)
+    seen.add(id(container.__dict__))
+    node_bytes = 0
+    for obj in nodes + storage:
+        seen.add(id(obj))
+        node_bytes += sys.getsizeof(obj)
+    for node in nodes:
+        # hidden per-node state, e.g. a node's __dict__ if it has no __slots__
+        for ref in gc.get_referents(node):
+            if isinstance(ref, dict) and id(ref) not in seen:
+                seen.add(id(ref))
+                node_bytes += sys.getsizeof(ref)
+
+    element_seen = set(seen)
+    element_bytes = 0
+    for e in elements:
+        element_bytes += deep_sizeof(e, element_seen)
+    for e in elements:
+        seen.add(id(e))
+    auxiliary_seen = element_seen | seen
+    auxiliary_bytes = 0
+    for value in container.__dict__.values():
+        auxiliary_bytes += deep_sizeof(value, auxiliary_seen)
+
+    shallow = own + node_bytes
+    list_bytes = sys.getsizeof(list(elements))
+    count = max(slots, 1)
+    report = {
+        'type': type(container).__name__,
+        'elements': size,
+        'nodes': slots,
+        'sentinels': sentinels,
+        'free_slots': slots - size - sentinels,
+        'container_bytes': own,
+        'node_bytes': node_bytes,
+        'shallow_bytes': shallow,
+        'shallow_bytes_per_node': node_bytes / count,
+        'element_bytes': element_bytes,
+        'deep_bytes': shallow + element_bytes + auxiliary_bytes,
+        'deep_bytes_per_node': (node_bytes + element_bytes) / count,
+        'auxiliary_bytes': auxiliary_bytes,
+        'list_bytes': list_bytes,
+        'overhead_bytes': shallow - list_bytes,
+        'overhead_ratio': shallow / list_bytes,
+    }
+
+    if hasattr(container, 'Position') and size:
+        p = container.first()
+        report['position_bytes'] = sys.getsizeof(p) + sys.getsizeof(p.__dict__)
+
+    if diff is not None:
+        report['tracemalloc'] = diff
+    return report
+
+
+def tracemalloc_diff(workload, top=10):
+    """Run workload() under tracemalloc and return the allocations it left behind
+
+    The result holds the net bytes and blocks allocated, and the top sites
+    (as 'file:line: size=..., count=...' strings) ordered by size difference.
+    Whatever workload returns is kept alive until the second snapshot.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = workload()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    del result
+    return {
+        'size_diff': sum(stat.size_diff for stat in stats),
+        'count_diff': sum(stat.count_diff for stat in stats),
+        'top': [str(stat) for stat in stats[:top]],
+    }
+
+
+if __name__ == '__main__':
+    import unittest
+
+    from arrayQueue import ArrayQueue
+    from arrayStack import ArrayStack
+    from circularlyLinkedList import CircularQueue
+    from doubleLinkedList import LinkedDeque, ArrayLinkedDeque, UnrolledLinkedDeque
+    from positionalList import PositionalList
+    from singlyLinkedList import linkedQueue, linkedStack
+    from singlyLinkedLists import LinkedQueue, LinkedStack
+
+    class TestMemoryReport(unittest.TestCase):
+
+        def fill(self, container, add, n=100):
+            for i in range(n):
+                add(container, str(i))
+            return memory_report(container)
+
+        def test_linked(self):
+            cases = [(LinkedStack(), LinkedStack.push, 0), (linkedStack(), linkedStack.push, 1),
+                     (LinkedQueue(), LinkedQueue.enqueue, 0), (linkedQueue(), linkedQueue.enqueue, 1),
+                     (CircularQueue(), CircularQueue.enqueue, 0), (LinkedDeque(), LinkedDeque.insert_last, 2)]
+            for container, add, sentinels in cases:
+                report = self.fill(container, add)
+                self.assertTrue(report['nodes'] == 100 + sentinels and report['sentinels'] == sentinels)
+                self.assertTrue(report['overhead_ratio'] > 1 and report['element_bytes'] > 100 * 40)
+
+        def test_arrays(self):
+            for container, add in ((ArrayQueue(), ArrayQueue.enqueue), (ArrayStack(), ArrayStack.push),
+                                   (ArrayLinkedDeque(), ArrayLinkedDeque.insert_last),
+                                   (UnrolledLinkedDeque(), UnrolledLinkedDeque.insert_last)):
+                report = self.fill(container, add)
+                self.assertTrue(report['elements'] == 100 and report['nodes'] >= 100 + report['sentinels'])
+                self.assertTrue(report['element_bytes'] > 100 * 40)
+            self.assertTrue(report['nodes'] == 2 * 64 and report['free_slots'] == 28)
+            linked = self.fill(LinkedDeque(), LinkedDeque.insert_last)
+            self.assertTrue(report['shallow_bytes'] < linked['shallow_bytes'])
+
+        def test_positional(self):
+            L = PositionalList()
+            L.enable_index()
+            report = self.fill(L, PositionalList.add_last)
+            self.assertTrue(report['position_bytes'] > 0 and report['auxiliary_bytes'] > 0)
+            report = memory_report(L, lambda L: [L.add_last(i) for i in range(1000)])
+            self.assertTrue(report['tracemalloc']['size_diff'] > 1000 * 56 and report['elements'] == 1100)
+            self.assertTrue(len(report['tracemalloc']['top']) <= 10)
+
+    unittest.main()
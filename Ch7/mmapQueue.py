@@ -0,0 +1,321 @@
+import mmap
+import os
+import struct
+import zlib
+
+from arrayQueue import Empty
+
+
+class MmapQueue:
+    """Persistent FIFO queue of byte records appended to memory-mapped segment files
+
+    Records are only ever appended, each as a header holding its length and
+    CRC-32 followed by its payload. When a segment is full, writing rolls
+    over to a new file. The read cursor is kept in a small memory-mapped file
+    with two checksummed slots that are written alternately. Every completed
+    enqueue or dequeue therefore survives the process being killed, and
+    reopening the directory recovers the queue. Segments that have been read
+    to the end are unmapped and deleted once no memoryview into them remains.
+    """
+    DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+    _RECORD = struct.Struct('II')           # length + 1, crc32 of the payload
+    _CURSOR = struct.Struct('QQQ')          # sequence, segment, offset
+    _CHECKSUM = struct.Struct('I')
+    _CURSOR_SLOT = 32
+
+    def __init__(self, path, segment_size=DEFAULT_SEGMENT_SIZE):
+        """Open the queue stored in directory path, creating it if needed"""
+        if segment_size <= self._RECORD.size:
+            raise ValueError("segment_size is too small to hold a record")
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._segment_size = segment_size
+        self._segments = {}
+        self._retired = []
+        self._cursor = self._map(os.path.join(path, 'cursor'), 2 * self._CURSOR_SLOT)
+        self._cursor_sequence = 0
+        self._recover()
+
+    def __len__(self):
+        """Return the number of records in the queue"""
+        return self._size
+
+    def is_empty(self):
+        """Return True if queue is empty"""
+        return self._size == 0
+
+    # ----------------- files ----------------- #
+    def _segment_path(self, number):
+        return os.path.join(self._path, '{:020d}.seg'.format(number))
+
+    def _map(self, filename, size):
+        """Return a writable mapping of filename, extending the file to size bytes"""
+        fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            return mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _segment(self, number):
+        """Return the mapping of segment number, creating the file if needed"""
+        mm = self._segments.get(number)
+        if mm is None:
+            mm = self._segments[number] = self._map(self._segment_path(number), self._segment_size)
+        return mm
+
+    def _record_at(self, mm, offset):
+        """Return (payload view, next offset) for a valid record at offset, or None"""
+        if offset + self._RECORD.size > self._segment_size:
+            return None
+        length, crc = self._RECORD.unpack_from(mm, offset)
+        start = offset + self._RECORD.size
+        if length == 0 or start + length - 1 > self._segment_size:
+            return None
+        view = memoryview(mm)[start:start + length - 1]
+        if zlib.crc32(view) != crc:
+            view.release()
+            return None
+        return view, start + length - 1
+
+    # ----------------- recovery ----------------- #
+    def _load_cursor(self):
+        """Return (segment, offset) from the newest valid cursor slot, or None"""
+        best = None
+        for slot in range(2):
+            base = slot * self._CURSOR_SLOT
+            fields = self._CURSOR.unpack_from(self._cursor, base)
+            checksum = self._CHECKSUM.unpack_from(self._cursor, base + self._CURSOR.size)[0]
+            raw = self._cursor[base:base + self._CURSOR.size]
+            if fields[0] and zlib.crc32(raw) == checksum and (best is None or fields[0] > best[0]):
+                best = fields
+        if best is None:
+            return None
+        self._cursor_sequence = best[0]
+        return best[1], best[2]
+
+    def _save_cursor(self):
+        """Persist the read cursor into the older of the two slots"""
+        self._cursor_sequence += 1
+        base = (self._cursor_sequence % 2) * self._CURSOR_SLOT
+        self._CURSOR.pack_into(self._cursor, base, self._cursor_sequence,
+                               self._read_segment, self._read_offset)
+        raw = self._cursor[base:base + self._CURSOR.size]
+        self._CHECKSUM.pack_into(self._cursor, base + self._CURSOR.size, zlib.crc32(raw))
+
+    def _recover(self):
+        """Rebuild the read and write positions from the files on disk"""
+        numbers = sorted(int(name[:-4]) for name in os.listdir(self._path) if name.endswith('.seg'))
+        cursor = self._load_cursor()
+        if cursor is None:
+            cursor = (numbers[0] if numbers else 0, 0)
+        self._read_segment, self._read_offset = cursor
+
+        for number in numbers:
+            if number < self._read_segment:
+                os.remove(self._segment_path(number))
+        self._write_segment = max(numbers[-1] if numbers else 0, self._read_segment)
+
+        # Find the end of the valid records and wipe anything torn beyond it
+        mm = self._segment(self._write_segment)
+        offset = self._read_offset if self._write_segment == self._read_segment else 0
+        record = self._record_at(mm, offset)
+        while record is not None:
+            record[0].release()
+            offset = record[1]
+            record = self._record_at(mm, offset)
+        mm[offset:] = bytes(self._segment_size - offset)
+        self._write_offset = offset
+
+        self._size = 0
+        segment, offset = self._read_segment, self._read_offset
+        while True:
+            record = self._record_at(self._segment(segment), offset)
+            if record is not None:
+                record[0].release()
+                offset = record[1]
+                self._size += 1
+            elif segment < self._write_segment:
+                segment, offset = segment + 1, 0
+            else:
+                break
+
+    # ----------------- queue operations ----------------- #
+    def enqueue(self, record):
+        """Append a bytes-like record to the back of the queue"""
+        n = len(record)
+        need = self._RECORD.size + n
+        if need > self._segment_size:
+            raise ValueError("record of {} bytes does not fit in a segment".format(n))
+        if self._write_offset + need > self._segment_size:
+            self._write_segment += 1
+            self._write_offset = 0
+
+        mm = self._segment(self._write_segment)
+        start = self._write_offset + self._RECORD.size
+        mm[start:start + n] = record
+        self._RECORD.pack_into(mm, self._write_offset, n + 1, zlib.crc32(record))
+        self._write_offset += need
+        self._size += 1
+
+    def _front(self):
+        """Return (payload view, next offset) of the front record, moving past finished segments"""
+        if self._size == 0:
+            raise Empty("Queue is empty")
+        while True:
+            record = self._record_at(self._segment(self._read_segment), self._read_offset)
+            if record is not None:
+                return record
+            self._retired.append(self._read_segment)
+            self._read_segment += 1
+            self._read_offset = 0
+
+    def first(self):
+        """Return (but do not remove) the front record as bytes"""
+        view, next_offset = self._front()
+        with view:
+            return bytes(view)
+
+    def dequeue(self):
+        """Remove and return the front record as bytes"""
+        self.compact()
+        view, self._read_offset = self._front()
+        with view:
+            record = bytes(view)
+        self._size -= 1
+        self._save_cursor()
+        return record
+
+    def dequeue_many(self, n):
+        """Remove and return a list of up to n records as zero-copy memoryviews
+
+        Each view stays valid until it is released; its segment file is only
+        unmapped and deleted by a later compact() after that.
+        """
+        self.compact()
+        views = []
+        for k in range(min(n, self._size)):
+            view, self._read_offset = self._front()
+            views.append(view)
+        self._size -= len(views)
+        self._save_cursor()
+        return views
+
+    def compact(self):
+        """Unmap and delete finished segments that no memoryview refers to any more"""
+        if self._cursor_sequence and self._retired:
+            self._save_cursor()
+        still_retired = []
+        for number in self._retired:
+            try:
+                self._segments[number].close()
+            except BufferError:
+                still_retired.append(number)
+                continue
+            del self._segments[number]
+            os.remove(self._segment_path(number))
+        self._retired = still_retired
+
+    def flush(self):
+        """Write dirty pages to disk, so the queue also survives an operating system crash"""
+        for mm in self._segments.values():
+            mm.flush()
+        self._cursor.flush()
+
+    def close(self):
+        """Unmap every file; views returned by dequeue_many must be released first"""
+        self.compact()
+        for mm in self._segments.values():
+            mm.close()
+        self._segments = {}
+        self._cursor.close()
+
+
+if __name__ == '__main__':
+    import multiprocessing
+    import signal
+    import tempfile
+    import unittest
+
+    def enqueue_then_die(path):
+        q = MmapQueue(path, segment_size=64)
+        for i in range(20):
+            q.enqueue(str(i).encode())
+        for i in range(7):
+            q.dequeue()
+        os.kill(os.getpid(), signal.SIGKILL)
+
+    class TestMmapQueue(unittest.TestCase):
+
+        def setUp(self):
+            self.dir = tempfile.TemporaryDirectory()
+            self.q = MmapQueue(self.dir.name, segment_size=64)
+
+        def tearDown(self):
+            self.q.close()
+            self.dir.cleanup()
+
+        def reopen(self):
+            self.q.close()
+            self.q = MmapQueue(self.dir.name, segment_size=64)
+
+        def test_fifo_rollover(self):
+            with self.assertRaises(Empty):
+                self.q.dequeue()
+            for i in range(30):
+                self.q.enqueue(b'record %d' % i)
+            self.q.enqueue(b'')
+            self.assertTrue(len(self.q) == 31 and self.q.first() == b'record 0')
+            for i in range(20):
+                self.assertTrue(self.q.dequeue() == b'record %d' % i)
+            self.assertTrue(self.q.dequeue_many(20)[-1] == b'')
+            self.assertTrue(self.q.is_empty())
+            with self.assertRaises(ValueError):
+                self.q.enqueue(bytes(64))
+
+        def test_reopen(self):
+            for i in range(10):
+                self.q.enqueue(bytes([i]) * i)
+            for i in range(4):
+                self.q.dequeue()
+            self.reopen()
+            self.assertTrue(len(self.q) == 6 and self.q.dequeue() == bytes([4]) * 4)
+            self.q.enqueue(b'new')
+            self.reopen()
+            self.assertTrue(self.q.dequeue_many(10)[-1] == b'new')
+
+        def test_compaction(self):
+            for i in range(30):
+                self.q.enqueue(b'record %d' % i)
+            views = self.q.dequeue_many(25)
+            self.q.compact()
+            self.assertTrue(views[0] == b'record 0')
+            self.assertTrue(os.path.exists(self.q._segment_path(0)))
+            for view in views:
+                view.release()
+            self.q.compact()
+            self.assertFalse(os.path.exists(self.q._segment_path(0)))
+            self.assertTrue(self.q.dequeue_many(10) == [b'record %d' % i for i in range(25, 30)])
+
+        def test_torn_write(self):
+            for i in range(3):
+                self.q.enqueue(b'abc')
+            mm = self.q._segment(self.q._write_segment)
+            MmapQueue._RECORD.pack_into(mm, self.q._write_offset, 4, 12345)
+            mm[self.q._write_offset + 8:self.q._write_offset + 11] = b'xyz'
+            self.reopen()
+            self.assertTrue(len(self.q) == 3)
+            self.q.enqueue(b'd')
+            self.assertTrue(self.q.dequeue_many(5) == [b'abc', b'abc', b'abc', b'd'])
+
+        def test_kill(self):
+            self.q.close()
+            p = multiprocessing.Process(target=enqueue_then_die, args=(self.dir.name,))
+            p.start()
+            p.join()
+            self.assertTrue(p.exitcode == -signal.SIGKILL)
+            self.q = MmapQueue(self.dir.name, segment_size=64)
+            self.assertTrue([int(v) for v in self.q.dequeue_many(20)] == list(range(7, 20)))
+
+    unittest.main()
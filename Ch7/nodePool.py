@@ -0,0 +1,53 @@
+class NodePool:
+    """Bounded free-list of nodes unlinked from a linked structure, kept for reuse.
+
+    A pool may be shared by several containers of the same class, since they
+    use the same node type.
+    """
+
+    def __init__(self, capacity=1024):
+        """Create an empty pool holding at most capacity nodes"""
+        if capacity < 0:
+            raise ValueError("capacity must be non-negative")
+        self._free = []
+        self._capacity = capacity
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Return the number of nodes waiting to be reused"""
+        return len(self._free)
+
+    def get(self):
+        """Return a recycled node, or None if the pool is empty"""
+        if self._free:
+            self.hits += 1
+            return self._free.pop()
+        self.misses += 1
+        return None
+
+    def put(self, node):
+        """Keep node for reuse unless the pool is already full"""
+        if len(self._free) < self._capacity:
+            self._free.append(node)
+
+    def stats(self):
+        """Return a dictionary of the pool's counters"""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._free), 'capacity': self._capacity}
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class TestNodePool(unittest.TestCase):
+        def test_bounded(self):
+            pool = NodePool(2)
+            self.assertIsNone(pool.get())
+            for i in range(3):
+                pool.put(object())
+            self.assertTrue(len(pool) == 2)
+            self.assertIsNotNone(pool.get())
+            self.assertTrue(pool.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'capacity': 2})
+
+    unittest.main()
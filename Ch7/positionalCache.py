@@ -0,0 +1,394 @@
+import functools
+import time
+
+from positionalList import PositionalList
+
+_MISSING = object()
+# Separates positional from keyword arguments in call keys, as in functools
+_KWARGS_MARK = object()
+
+
+class _CacheBase:
+    """Shared bookkeeping of the caches: TTL expiry, eviction callback and statistics
+
+    Subclasses keep entries in positional lists and map each key to its _Item
+    in self._items; they provide _touch, _insert, _unlink, _victim and _reset.
+    """
+
+    class _Item:
+        """Lightweight, nonpublic class for storing a cached entry."""
+        __slots__ = '_key', '_value', '_expires', '_position', '_bucket'
+
+        def __init__(self, key, value, expires):
+            self._key = key
+            self._value = value
+            self._expires = expires
+            self._position = None
+            self._bucket = None
+
+    def __init__(self, maxsize, ttl=None, on_evict=None, clock=time.monotonic):
+        """Create an empty cache holding at most maxsize entries
+
+        Entries expire ttl seconds (measured by clock) after they were put,
+        if ttl is given. on_evict(key, value) is called for every entry
+        dropped to make room or because it expired.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._on_evict = on_evict
+        self._clock = clock
+        self._items = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        """Return the number of entries in the cache, including ones not yet found expired"""
+        return len(self._items)
+
+    def __contains__(self, key):
+        """Return True if key has a live entry, without counting it as a use"""
+        item = self._items.get(key)
+        return item is not None and not self._expired(item)
+
+    def _expired(self, item):
+        return item._expires is not None and self._clock() >= item._expires
+
+    def _drop(self, item, expired):
+        """Remove item because it expired or to make room, and report it"""
+        self._unlink(item)
+        del self._items[item._key]
+        if expired:
+            self.expirations += 1
+        else:
+            self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(item._key, item._value)
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as used, or default if it is absent or expired"""
+        item = self._items.get(key)
+        if item is not None and self._expired(item):
+            self._drop(item, True)
+            item = None
+        if item is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(item)
+        return item._value
+
+    def put(self, key, value, ttl=None):
+        """Store value for key, evicting an entry if the cache is full
+
+        ttl overrides the cache's default time to live for this entry.
+        """
+        ttl = self._ttl if ttl is None else ttl
+        expires = None if ttl is None else self._clock() + ttl
+        item = self._items.get(key)
+        if item is not None:
+            item._value = value
+            item._expires = expires
+            self._touch(item)
+            return
+        if len(self._items) >= self._maxsize:
+            self._drop(self._victim(), False)
+        item = self._items[key] = self._Item(key, value, expires)
+        self._insert(item)
+
+    def pop(self, key, default=_MISSING):
+        """Remove key and return its value, or default if given, else raise KeyError"""
+        item = self._items.get(key)
+        if item is None or self._expired(item):
+            if item is not None:
+                self._drop(item, True)
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._unlink(item)
+        del self._items[key]
+        return item._value
+
+    def expire(self):
+        """Drop every expired entry now and return how many there were"""
+        expired = [item for item in self._items.values() if self._expired(item)]
+        for item in expired:
+            self._drop(item, True)
+        return len(expired)
+
+    def clear(self):
+        """Remove every entry without calling on_evict; statistics are kept"""
+        self._items = {}
+        self._reset()
+
+    def stats(self):
+        """Return a dictionary of the cache's counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'expirations': self.expirations, 'size': len(self._items), 'maxsize': self._maxsize}
+
+
+class LRUCache(_CacheBase):
+    """A cache evicting the least recently used entry
+
+    Entries are kept in a PositionalList from most to least recently used and
+    a dict maps each key to its entry, which knows its Position, so get, put
+    and pop take O(1) time.
+    """
+
+    def __init__(self, maxsize, ttl=None, on_evict=None, clock=time.monotonic):
+        super().__init__(maxsize, ttl, on_evict, clock)
+        self._order = PositionalList()
+
+    def _reset(self):
+        self._order = PositionalList()
+
+    def _insert(self, item):
+        item._position = self._order.add_first(item)
+
+    def _unlink(self, item):
+        self._order.delete(item._position)
+
+    def _touch(self, item):
+        """Move item to the front of the list, relinking its node in place"""
+        order = self._order
+        node = order._validate(item._position)
+        if order._prev_of(node) != order._header:
+            order._move_after(node, order._header)
+
+    def _victim(self):
+        return self._order.last().element()
+
+
+class LFUCache(_CacheBase):
+    """A cache evicting the least frequently used entry, least recently used among ties
+
+    A PositionalList of buckets is kept in increasing order of use count, and
+    each bucket holds a PositionalList of its entries from most to least
+    recently used. Using an entry moves it to the next bucket, so get, put
+    and pop take O(1) time.
+    """
+
+    class _Bucket:
+        """Lightweight, nonpublic class for the entries used the same number of times."""
+        __slots__ = '_count', '_entries'
+
+        def __init__(self, count):
+            self._count = count
+            self._entries = PositionalList()
+
+    def __init__(self, maxsize, ttl=None, on_evict=None, clock=time.monotonic):
+        super().__init__(maxsize, ttl, on_evict, clock)
+        self._buckets = PositionalList()
+
+    def _reset(self):
+        self._buckets = PositionalList()
+
+    def _place(self, item, bucket):
+        """Add item to the front of the bucket at Position bucket"""
+        item._bucket = bucket
+        item._position = bucket.element()._entries.add_first(item)
+
+    def _insert(self, item):
+        first = self._buckets.first()
+        if first is None or first.element()._count != 1:
+            first = self._buckets.add_first(self._Bucket(1))
+        self._place(item, first)
+
+    def _unlink(self, item):
+        entries = item._bucket.element()._entries
+        entries.delete(item._position)
+        if entries.is_empty():
+            self._buckets.delete(item._bucket)
+
+    def _touch(self, item):
+        """Move item to the bucket counting one more use"""
+        bucket = item._bucket
+        count = bucket.element()._count + 1
+        successor = self._buckets.after(bucket)
+        if successor is None or successor.element()._count != count:
+            successor = self._buckets.add_after(bucket, self._Bucket(count))
+        self._unlink(item)
+        self._place(item, successor)
+
+    def _victim(self):
+        return self._buckets.first().element()._entries.last().element()
+
+    def use_count(self, key):
+        """Return how many times key has been put or found since it entered the cache"""
+        return self._items[key]._bucket.element()._count
+
+
+def hashable_key(value):
+    """Return a hashable stand-in for value, converting lists, tuples, dicts and sets recursively
+
+    Suitable as the key adapter of the cache decorators when arguments may be
+    unhashable. Each converted container is tagged with its kind, so a dict
+    and a set of pairs, or a list and a tuple, never share a key.
+    """
+    if isinstance(value, list):
+        return (list, tuple(hashable_key(v) for v in value))
+    if isinstance(value, tuple):
+        return (tuple, tuple(hashable_key(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, frozenset((k, hashable_key(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (set, frozenset(hashable_key(v) for v in value))
+    return value
+
+
+def _cached(cache, key):
+    """Return a decorator memoizing a function in cache, keying calls with key(args, kwargs)"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            k = key(args, kwargs)
+            result = cache.get(k, _MISSING)
+            if result is _MISSING:
+                result = function(*args, **kwargs)
+                cache.put(k, result)
+            return result
+        wrapper.cache = cache
+        wrapper.cache_info = cache.stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+def _call_key(adapter):
+    """Return a function mapping (args, kwargs) to a hashable key, converting each argument with adapter"""
+    if adapter is None:
+        return lambda args, kwargs: args + (_KWARGS_MARK, frozenset(kwargs.items())) if kwargs else args
+
+    def key(args, kwargs):
+        k = tuple(adapter(a) for a in args)
+        if kwargs:
+            k += (_KWARGS_MARK, frozenset((name, adapter(v)) for name, v in kwargs.items()))
+        return k
+    return key
+
+
+def lru_cache(maxsize=128, ttl=None, key=None, on_evict=None):
+    """Decorator memoizing a function in an LRUCache, like functools.lru_cache
+
+    key, if given, converts each argument to something hashable, for example
+    hashable_key. The wrapper has cache, cache_info() and cache_clear().
+    """
+    return _cached(LRUCache(maxsize, ttl, on_evict), _call_key(key))
+
+
+def lfu_cache(maxsize=128, ttl=None, key=None, on_evict=None):
+    """Decorator memoizing a function in an LFUCache; see lru_cache"""
+    return _cached(LFUCache(maxsize, ttl, on_evict), _call_key(key))
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class TestLRUCache(unittest.TestCase):
+        cls = LRUCache
+
+        def setUp(self):
+            self.evicted = []
+            self.clock = FakeClock()
+            self.cache = self.cls(3, on_evict=lambda k, v: self.evicted.append(k), clock=self.clock)
+
+        def test_get_put_pop(self):
+            for k in 'abc':
+                self.cache.put(k, k.upper())
+            self.assertTrue(self.cache.get('a') == 'A' and self.cache.get('z') is None)
+            self.cache.put('b', 'B2')
+            self.assertTrue(self.cache.pop('b') == 'B2' and 'b' not in self.cache)
+            self.assertTrue(self.cache.pop('b', 0) == 0)
+            with self.assertRaises(KeyError):
+                self.cache.pop('b')
+            self.assertTrue(len(self.cache) == 2)
+            self.assertTrue(self.cache.stats()['hits'] == 1 and self.cache.stats()['misses'] == 1)
+
+        def test_eviction(self):
+            for k in 'abc':
+                self.cache.put(k, k)
+            self.cache.get('a')
+            self.cache.put('d', 'd')
+            self.assertTrue(self.evicted == ['b'] and 'a' in self.cache and 'd' in self.cache)
+            self.assertTrue(self.cache.stats()['evictions'] == 1)
+
+        def test_ttl(self):
+            self.cache.put('a', 1, ttl=5)
+            self.cache.put('b', 2, ttl=10)
+            self.cache.put('c', 3)
+            self.clock.now = 5
+            self.assertTrue(self.cache.get('a') is None and self.evicted == ['a'])
+            self.clock.now = 10
+            self.assertTrue(self.cache.expire() == 1 and len(self.cache) == 1)
+            self.assertTrue(self.cache.stats()['expirations'] == 2)
+
+        def test_decorator(self):
+            calls = []
+            decorator = lru_cache if self.cls is LRUCache else lfu_cache
+
+            @decorator(maxsize=2, key=hashable_key)
+            def total(values, scale=1):
+                calls.append(values)
+                return sum(values) * scale
+
+            self.assertTrue(total([1, 2]) == 3 and total([1, 2]) == 3)
+            self.assertTrue(total([1, 2], scale=2) == 6 and len(calls) == 2)
+            self.assertTrue(total.cache_info()['hits'] == 1)
+            total.cache_clear()
+            total([1, 2])
+            self.assertTrue(len(calls) == 3)
+            with self.assertRaises(TypeError):
+                decorator()(sum)([1, 2])
+
+        def test_touch_in_place(self):
+            for k in 'abc':
+                self.cache.put(k, k.upper())
+            item = self.cache._items['a']
+            position = item._position
+            self.cache.get('b')
+            self.cache.get('a')
+            if self.cls is LRUCache:
+                self.assertTrue(item._position is position and self.cache._order.first() == position)
+            self.cache.put('d', 'D')
+            self.assertTrue(self.evicted == ['c'])
+
+        def test_container_kinds(self):
+            decorator = lru_cache if self.cls is LRUCache else lfu_cache
+            f = decorator(key=hashable_key)(lambda value: type(value).__name__)
+            self.assertTrue(f({1: 2}) == 'dict' and f({(1, 2)}) == 'set')
+            self.assertTrue(f([1, [2]]) == 'list' and f((1, [2])) == 'tuple')
+            self.assertTrue(f(frozenset({(1, 2)})) == 'set' and f.cache_info()['hits'] == 1)
+
+        def test_keyword_key(self):
+            for key in (None, hashable_key):
+                decorator = lru_cache if self.cls is LRUCache else lfu_cache
+                f = decorator(key=key)(lambda *args, **kwargs: (args, kwargs))
+                self.assertTrue(f(a=1) == ((), {'a': 1}))
+                self.assertTrue(f((), frozenset({('a', 1)})) == (((), frozenset({('a', 1)})), {}))
+
+    class TestLFUCache(TestLRUCache):
+        cls = LFUCache
+
+        def test_eviction(self):
+            for k in 'abc':
+                self.cache.put(k, k)
+            self.cache.get('a')
+            self.cache.get('a')
+            self.cache.get('c')
+            self.cache.put('d', 'd')
+            self.assertTrue(self.evicted == ['b'] and self.cache.use_count('a') == 3)
+            self.cache.put('e', 'e')
+            self.assertTrue(self.evicted == ['b', 'd'])
+            self.assertTrue(self.cache.use_count('c') == 2 and len(self.cache._buckets) == 3)
+
+    unittest.main()
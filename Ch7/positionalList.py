@@ -1,9 +1,83 @@
+import builtins
+import collections
+import heapq
+
 from doubleLinkedList import _DoublyLinkedBase
+from doubleLinkedList import _ArrayLinkedBase
 from doubleLinkedList import Empty
 
 
+class _RunningAggregates:
+    """Sum, minimum and maximum of a changing multiset of numbers
+
+    Removed values are only dropped from the heaps once they reach the top,
+    so reading the minimum or maximum takes amortized O(log n) time.
+    """
+
+    def __init__(self, values):
+        """Create aggregates over an iterable of values"""
+        values = list(values)
+        self.count = len(values)
+        self.total = builtins.sum(values)
+        self._low = values
+        self._high = [-v for v in values]
+        heapq.heapify(self._low)
+        heapq.heapify(self._high)
+        self._low_removed = collections.Counter()
+        self._high_removed = collections.Counter()
+
+    def add(self, v):
+        """Add value v"""
+        self.count += 1
+        self.total += v
+        heapq.heappush(self._low, v)
+        heapq.heappush(self._high, -v)
+
+    def remove(self, v):
+        """Remove one occurrence of value v"""
+        self.count -= 1
+        self.total -= v
+        self._low_removed[v] += 1
+        self._high_removed[-v] += 1
+        if len(self._low) > 2 * self.count + 32:
+            self._compact()
+
+    def min(self):
+        """Return the smallest value"""
+        self._prune(self._low, self._low_removed)
+        return self._low[0]
+
+    def max(self):
+        """Return the largest value"""
+        self._prune(self._high, self._high_removed)
+        return -self._high[0]
+
+    @staticmethod
+    def _prune(heap, removed):
+        """Pop removed values off the top of heap"""
+        while heap and removed[heap[0]]:
+            removed[heapq.heappop(heap)] -= 1
+
+    def _compact(self):
+        """Rebuild both heaps without the values removed so far"""
+        for heap, removed in ((self._low, self._low_removed), (self._high, self._high_removed)):
+            live = []
+            for v in heap:
+                if removed[v]:
+                    removed[v] -= 1
+                else:
+                    live.append(v)
+            heapq.heapify(live)
+            heap[:] = live
+            removed.clear()
+
+
 class PositionalList(_DoublyLinkedBase):
     """A sequential container of elements allowing positional access"""
+    HEURISTICS = ('move_to_front', 'transpose', 'count')
+    _INSTRUMENTED = ('first', 'last', 'before', 'after', 'add_first', 'add_last',
+                     'add_before', 'add_after', 'delete', 'replace', 'sort')
+    _SEARCHES = ('find', 'find_recursive')
 
     class Position:
         """An abstraction representing the location of a single element."""
@@ -15,29 +89,41 @@ class PositionalList(_DoublyLinkedBase):
 
         def element(self):
             """Return the element stored at this position."""
-            return self._node._element
+            return self._container._element_of(self._node)
 
         def __eq__(self, other):
             """Return True if other is a Position representing the same location"""
-            return type(other) is type(self) and other._node is self._node
+            return type(other) is type(self) and other._node == self._node
 
         def __ne__(self, other):
             """Return True if other is a Position representing a different location"""
             return not (self == other)
 
+    def __init__(self):
+        """Create an empty list
+
+        Deleted nodes are never recycled through a NodePool, since a stale
+        Position would come back to life when its node was reused.
+        """
+        super().__init__()
+        self._aggregates = None
+        self._heuristic = None
+        self._access = None
+        self.find_probes = 0
+
     def _validate(self, p):
         """Return position's node, or raise appropriate error if invalid"""
         if not isinstance(p, self.Position):
             raise TypeError('p must be proper Position type')
         if p._container is not self:
             raise ValueError('p does not belong in this container')
-        if p._node._next is None:
+        if not self._is_live(p._node):
             raise ValueError('p is no longer valid')
         return p._node
 
     def _make_position(self, node):
         """Return Position instance for given node (or None if sentinel)"""
-        if node is self._header or node is self._trailer:
+        if node == self._header or node == self._trailer:
             return None
         else:
             return self.Position(self, node)
@@ -45,66 +131,142 @@ class PositionalList(_DoublyLinkedBase):
     # ----------------- accessors ----------------- #
     def first(self):
         """Return position of first element in the list"""
-        return self._make_position(self._header._next)
+        return self._make_position(self._next_of(self._header))
 
     def last(self):
         """Return position of last element in the list"""
-        return self._make_position(self._trailer._prev)
+        return self._make_position(self._prev_of(self._trailer))
 
     def before(self, p):
         """Return position of element before p"""
         node = self._validate(p)
-        return self._make_position(node._prev)
+        return self._make_position(self._prev_of(node))
 
     def after(self, p):
         """Return position of element after p"""
         node = self._validate(p)
-        return self._make_position(node._next)
+        return self._make_position(self._next_of(node))
+
+    def __getitem__(self, k):
+        """Return the element at index k, in O(log n) time once the rank index is enabled"""
+        return self._element_of(self._node_at(k))
+
+    def position_at(self, k):
+        """Return the position at index k"""
+        return self._make_position(self._node_at(k))
+
+    def index_of(self, p):
+        """Return the index of Position p"""
+        return self._rank_of(self._validate(p))
 
     def find(self, e):
-        """Return the first position of the element e"""
-        curr = self.first()
-        while curr is not None:
-            if curr.element() == e:
-                return curr
-            curr = self.after(curr)
-        return None
+        """Return the first position of the element e (or None if not found)"""
+        if self._heuristic is not None:
+            return self._find_organizing(e)
+        node = self._find_node(e)
+        if node is None:
+            return None
+        return self._make_position(node)
+
+    def _find_organizing(self, e):
+        """Find e, through the index if there is one, and move its node according to the heuristic"""
+        header = self._header
+        node = None
+        if self._index is not None:
+            self.find_probes += 1
+            node = self._find_node(e)
+        else:
+            for candidate in self._iter_nodes():
+                self.find_probes += 1
+                if self._element_of(candidate) == e:
+                    node = candidate
+                    break
+        if node is None:
+            return None
+
+        count = self._access[node] = self._access.get(node, 0) + 1
+        prev = self._prev_of(node)
+        if prev != header:
+            if self._heuristic == 'move_to_front':
+                self._move_after(node, header)
+            elif self._heuristic == 'transpose':
+                self._move_after(node, self._prev_of(prev))
+            else:
+                walk = prev
+                while walk != header and self._access.get(walk, 0) < count:
+                    walk = self._prev_of(walk)
+                if walk != prev:
+                    self._move_after(node, walk)
+        return self._make_position(node)
+
+    def enable_self_organizing(self, heuristic='move_to_front'):
+        """Reorder the list on every successful find, so frequently sought elements drift forward
+
+        With 'move_to_front' the node found is moved to the front, with
+        'transpose' it swaps places with its predecessor, and with 'count' it
+        moves ahead of the nodes found fewer times. Nodes are relinked rather
+        than reallocated, so every Position stays valid. Without an index,
+        find then scans from the front, adding the nodes examined to
+        find_probes; with one, each lookup adds a single probe.
+        """
+        if heuristic not in self.HEURISTICS:
+            raise ValueError("heuristic must be one of {}".format(self.HEURISTICS))
+        self._heuristic = heuristic
+        if self._access is None:
+            self._access = {}
+
+    def disable_self_organizing(self):
+        """Stop reordering on find and drop the access counters"""
+        self._heuristic = None
+        self._access = None
+
+    def access_count(self, p):
+        """Return how many times find has returned Position p while self-organizing"""
+        node = self._validate(p)
+        return self._access.get(node, 0) if self._access is not None else 0
 
     def find_recursive(self, e, curr=None):
-        if self.is_empty():
-            return
-        if not curr:
-            curr = self.first()
-        """Recursively return the first position of the element e"""
-        if curr.element() == e:
-            return curr
-        if curr == self.last():
-            return
-        return self.find_recursive(e, self.after(curr))
+        """Return the first position of the element e at or after Position curr
+
+        Walks the list with a loop rather than one recursive call per element,
+        so it is not bounded by the recursion limit.
+        """
+        if curr is None:
+            return self.find(e)
+        for node in self._iter_nodes(start=self._validate(curr)):
+            if self._element_of(node) == e:
+                return self._make_position(node)
+        return None
 
     def __iter__(self):
         """Generate a forward iteration of the elements in the list"""
-        cursor = self.first()
-        while cursor is not None:
-            yield cursor.element()
-            cursor = self.after(cursor)
+        return self._iter_elements()
 
     def __reversed__(self):
         """Generate a backward iteration of the elements in the list"""
-        cursor = self.last()
-        while cursor is not self.first():
-            yield cursor.element()
-            cursor = self.before(cursor)
+        return self._iter_elements(reverse=True)
+
+    def positions(self, reverse=False):
+        """Generate the positions of the list from front to back (or back to front)"""
+        for node in self._iter_nodes(reverse):
+            yield self._make_position(node)
+
+    def items(self, reverse=False):
+        """Generate (position, element) pairs from front to back (or back to front)"""
+        for node in self._iter_nodes(reverse):
+            yield self._make_position(node), self._element_of(node)
 
     # ----------------- mutators ----------------- #
     def _insert_between(self, e, predecessor, successor):
         """Add element between existing nodes and return new Position."""
         node = super()._insert_between(e, predecessor, successor)
+        if self._aggregates is not None:
+            self._aggregates.add(e)
         return self._make_position(node)
 
     def add_first(self, e):
         """"Insert element e at the front of the list and return new Position."""
-        return self._insert_between(e, self._header, self._header._next)
+        return self._insert_between(e, self._header, self._next_of(self._header))
 
     def add_last_new(self, e):
         """Insert element e at the back of the list and return new Position"""
@@ -120,41 +282,115 @@ class PositionalList(_DoublyLinkedBase):
 
     def add_last(self, e):
         """Insert element e at the back of the list and return new Position"""
-        return self._insert_between(e, self._trailer._prev, self._trailer)
+        return self._insert_between(e, self._prev_of(self._trailer), self._trailer)
 
     def add_before(self, p ,e):
         """Insert element e before Position p"""
         node = self._validate(p)
-        return self._insert_between(e, node._prev, node)
+        return self._insert_between(e, self._prev_of(node), node)
 
     def add_after(self, p, e):
         node = self._validate(p)
-        return self._insert_between(e, node, node._next)
+        return self._insert_between(e, node, self._next_of(node))
 
     def delete(self, p):
         """Remove and return the element at Position p"""
         node = self._validate(p)
-        return self._delete_node(node)
+        elem = self._delete_node(node)
+        if self._aggregates is not None:
+            self._aggregates.remove(elem)
+        if self._access is not None:
+            self._access.pop(node, None)
+        return elem
 
     def replace(self, p, e):
         """Replace the element at Position p with e"""
         original = self._validate(p)
-        old_value = original._element
-        original._element = e
+        old_value = self._element_of(original)
+        self._set_element(original, e)
+        if self._aggregates is not None:
+            self._aggregates.remove(old_value)
+            self._aggregates.add(e)
         return old_value
 
-    def max(self):
-        """Return the maximum positional element in the Positional List L"""
+    def sort(self, key=None, reverse=False):
+        """Stably sort the list in place by relinking its nodes
+
+        Nodes are gathered into a list and ordered by Python's natural merge
+        sort, which exploits runs already present, before being relinked in a
+        single pass. No node is reallocated, so every Position stays valid.
+        """
+        nodes = list(self._iter_nodes())
+        element_of = self._element_of
+        if key is None:
+            nodes.sort(key=element_of, reverse=reverse)
+        else:
+            nodes.sort(key=lambda node: key(element_of(node)), reverse=reverse)
+        self._relink(nodes)
+
+    # ----------------- aggregates ----------------- #
+    def enable_aggregates(self):
+        """Keep a running sum, minimum and maximum of the (numeric) elements
+
+        min(), max() and sum() without a key then take O(1) or amortized
+        O(log n) time instead of a full scan.
+        """
+        self._aggregates = _RunningAggregates(self._iter_elements())
+
+    def disable_aggregates(self):
+        """Stop maintaining the running aggregates"""
+        self._aggregates = None
+
+    def max(self, key=None):
+        """Return the maximum element in the list"""
         if self.is_empty():
             raise Empty("List is empty")
+        if key is None and self._aggregates is not None:
+            return self._aggregates.max()
+        return builtins.max(self._iter_elements(), key=key)
+
+    def min(self, key=None):
+        """Return the minimum element in the list"""
+        if self.is_empty():
+            raise Empty("List is empty")
+        if key is None and self._aggregates is not None:
+            return self._aggregates.min()
+        return builtins.min(self._iter_elements(), key=key)
+
+    def sum(self, start=0):
+        """Return start plus the sum of the elements in the list"""
+        if self._aggregates is not None:
+            return start + self._aggregates.total
+        return builtins.sum(self._iter_elements(), start)
+
+    def top_k(self, k, key=None):
+        """Return a list of the k largest elements, largest first"""
+        return heapq.nlargest(k, self._iter_elements(), key=key)
+
+
+class ArrayPositionalList(PositionalList, _ArrayLinkedBase):
+    """A positional list stored in parallel arrays instead of one node object per element"""
+
+    class Position(PositionalList.Position):
+        """A location that also records the generation of its slot when handed out"""
+
+        def __eq__(self, other):
+            """Return True if other is a Position representing the same location in the same generation"""
+            return super().__eq__(other) and other._generation == self._generation
+
+    def _validate(self, p):
+        """Return position's node, or raise appropriate error if invalid"""
+        node = super()._validate(p)
+        if p._generation != self._generation[node]:
+            raise ValueError('p is no longer valid')
+        return node
 
-        maxvalue = 0
-        value = self.first()
-        while value is not None:
-            if value.element() > maxvalue:
-                maxvalue = value.element()
-            value = self.after(value)
-        return maxvalue
+    def _make_position(self, node):
+        """Return Position instance for given node (or None if sentinel)"""
+        p = super()._make_position(node)
+        if p is not None:
+            p._generation = self._generation[node]
+        return p
 
 
 def insertion_sort(L):
@@ -189,12 +425,7 @@ def max(L):
     """Return the maximum positional element in the Positional List L"""
     if L.is_empty():
         raise Empty("List is empty")
-
-    maxvalue = 0
-    for e in L:
-        if e > maxvalue:
-            maxvalue = e
-    return maxvalue
+    return L.max()
 
 
 if __name__ == '__main__':
@@ -234,34 +465,157 @@ if __name__ == '__main__':
             self.pl.delete(self.pl.find_recursive(5))
             self.assertTrue(self.pl.before(self.pl.find_recursive(5)).element() == 1)
 
-    unittest.main()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        def test_find_recursive_instrumented(self):
+            positions = [self.pl.add_last(i) for i in range(10)]
+            self.pl.enable_instrumentation()
+            self.assertTrue(self.pl.find_recursive(9, positions[0]) == positions[9])
+            self.assertTrue(self.pl.find_recursive(9, positions[7]) == positions[9])
+            searches = self.pl.stats()['searches']
+            self.assertTrue(searches['count'] == 2 and searches['nodes'] == 10 + 3)
+
+        def test_find_long_list(self):
+            for i in range(5000):
+                self.pl.add_last(i)
+            self.assertTrue(self.pl.find_recursive(4999).element() == 4999)
+            self.assertTrue(self.pl.find_recursive(1, self.pl.find(2)) is None)
+
+        def test_find_indexed(self):
+            for i in range(10):
+                self.pl.add_last(i % 5)
+            self.pl.enable_index()
+            self.assertTrue(self.pl.find(3) == self.pl.after(self.pl.find(2)))
+            self.pl.delete(self.pl.find(3))
+            self.assertTrue(self.pl.before(self.pl.find(3)).element() == 2)
+            self.pl.replace(self.pl.find(3), 7)
+            self.assertIsNone(self.pl.find(3))
+            self.assertTrue(self.pl.find(7) == self.pl.before(self.pl.last()))
+            self.pl.disable_index()
+            self.assertTrue(self.pl.find(7).element() == 7)
+
+        def test_sort(self):
+            self.pl.sort()
+            data = [5, 3, 8, 1, 9, 2, 7, 3]
+            positions = [self.pl.add_last(e) for e in data]
+            self.pl.sort()
+            self.assertTrue(list(self.pl) == sorted(data))
+            self.assertTrue(list(reversed(self.pl)) == sorted(data, reverse=True))
+            self.assertTrue(self.pl.after(positions[4]) is None)
+            self.assertTrue(self.pl.before(positions[3]) is None)
+            self.assertTrue(self.pl.after(positions[1]) == positions[7])
+
+            self.pl.sort(key=lambda e: e % 2, reverse=True)
+            self.assertTrue(list(self.pl) == [1, 3, 3, 5, 7, 9, 2, 8])
+            self.pl.sort(key=lambda e: e % 2)
+            self.assertTrue(list(self.pl) == [2, 8, 1, 3, 3, 5, 7, 9])
+
+        def test_aggregates(self):
+            with self.assertRaises(Empty):
+                self.pl.max()
+            self.assertTrue(self.pl.sum() == 0)
+            for e in [-5, -3, -8, -1]:
+                self.pl.add_last(e)
+            self.assertTrue(self.pl.max() == -1 and max(self.pl) == -1)
+            self.assertTrue(self.pl.min() == -8 and self.pl.sum() == -17)
+            self.assertTrue(self.pl.max(key=abs) == -8)
+            self.assertTrue(self.pl.top_k(2) == [-1, -3])
+            self.assertTrue(self.pl.top_k(1, key=abs) == [-8])
+
+        def test_running_aggregates(self):
+            self.pl.add_last(4)
+            self.pl.enable_aggregates()
+            positions = [self.pl.add_last(e) for e in range(10)]
+            self.assertTrue((self.pl.min(), self.pl.max(), self.pl.sum()) == (0, 9, 49))
+            self.pl.delete(positions[9])
+            self.pl.delete(positions[0])
+            self.assertTrue((self.pl.min(), self.pl.max(), self.pl.sum()) == (1, 8, 40))
+            self.pl.replace(positions[8], -2)
+            self.assertTrue((self.pl.min(), self.pl.max(), self.pl.sum()) == (-2, 7, 30))
+            for p in positions[1:8]:
+                self.pl.delete(p)
+            for i in range(100):
+                self.pl.delete(self.pl.add_first(i))
+            self.assertTrue((self.pl.min(), self.pl.max(), self.pl.sum()) == (-2, 4, 2))
+            self.assertTrue(len(self.pl._aggregates._low) < 50)
+
+        def test_self_organizing(self):
+            positions = [self.pl.add_last(i) for i in range(6)]
+            with self.assertRaises(ValueError):
+                self.pl.enable_self_organizing('random')
+            self.pl.enable_self_organizing()
+            self.assertTrue(self.pl.find(4) == positions[4] and list(self.pl) == [4, 0, 1, 2, 3, 5])
+            self.assertTrue(self.pl.find_probes == 5 and self.pl.find(9) is None)
+            self.pl.enable_self_organizing('transpose')
+            self.pl.find(2)
+            self.assertTrue(list(self.pl) == [4, 0, 2, 1, 3, 5])
+            self.pl.enable_self_organizing('count')
+            self.pl.find(3)
+            self.pl.find(3)
+            self.pl.find(5)
+            self.assertTrue(list(self.pl) == [3, 4, 0, 2, 5, 1])
+            self.pl.find(5)
+            self.assertTrue(list(self.pl) == [3, 5, 4, 0, 2, 1])
+            self.assertTrue(self.pl.access_count(positions[3]) == 2)
+            self.pl.enable_rank_index()
+            self.pl.find(1)
+            self.pl.find(1)
+            self.assertTrue(list(self.pl) == [3, 5, 1, 4, 0, 2])
+            self.assertTrue(self.pl.index_of(positions[1]) == 2 and self.pl[3] == 4)
+            self.pl.delete(positions[3])
+            self.pl.disable_self_organizing()
+            self.assertTrue(self.pl.access_count(positions[5]) == 0)
+
+        def test_self_organizing_indexed(self):
+            positions = [self.pl.add_last(i) for i in range(5)]
+            self.pl.enable_index()
+            self.pl.enable_self_organizing('transpose')
+            self.pl.enable_instrumentation()
+            self.assertTrue(self.pl.find(4) == positions[4] and list(self.pl) == [0, 1, 2, 4, 3])
+            self.assertTrue(self.pl.find(7) is None and self.pl.find_probes == 2)
+            self.assertTrue(self.pl.stats()['searches']['nodes'] == 0)
+
+        def test_indexing(self):
+            positions = [self.pl.add_last(i) for i in range(20)]
+            for ranked in (False, True):
+                if ranked:
+                    self.pl.enable_rank_index()
+                self.assertTrue(self.pl[0] == 0 and self.pl[-1] == 19 and self.pl[12] == 12)
+                self.assertTrue(self.pl.position_at(5) == positions[5])
+                self.assertTrue(self.pl.index_of(positions[17]) == 17)
+            self.pl.add_after(positions[3], 'a')
+            self.pl.add_before(positions[3], 'b')
+            self.pl.delete(positions[0])
+            self.assertTrue(self.pl.index_of(positions[3]) == 3 and self.pl[4] == 'a')
+            self.pl.sort(key=str, reverse=True)
+            self.assertTrue(self.pl[0] == 'b' and self.pl.index_of(positions[9]) == 2)
+            with self.assertRaises(IndexError):
+                self.pl.position_at(21)
+
+        def test_iteration(self):
+            self.assertTrue(list(self.pl) == [] and list(reversed(self.pl)) == [])
+            for i in range(5):
+                self.pl.add_last(i)
+            self.assertTrue(list(self.pl) == [0, 1, 2, 3, 4])
+            self.assertTrue(list(reversed(self.pl)) == [4, 3, 2, 1, 0])
+            self.assertTrue([p.element() for p in self.pl.positions()] == [0, 1, 2, 3, 4])
+            self.assertTrue(next(self.pl.positions(reverse=True)) == self.pl.last())
+            for p, e in self.pl.items():
+                self.assertTrue(p.element() == e)
+                self.pl.replace(p, e * 2)
+            self.assertTrue(list(self.pl) == [0, 2, 4, 6, 8])
+
+    class TestArrayPositionalList(TestPositionalList):
 
+        def setUp(self):
+            self.pl = ArrayPositionalList()
+
+        def test_stale_position(self):
+            p = self.pl.add_first(1)
+            self.pl.delete(p)
+            q = self.pl.add_first(2)
+            self.assertTrue(q._node == p._node and p != q)
+            with self.assertRaises(ValueError):
+                self.pl.after(p)
+            self.assertTrue(self.pl.replace(q, 3) == 2)
+            self.assertTrue(list(self.pl) == [3])
 
+    unittest.main()
@@ -0,0 +1,392 @@
+from positionalList import PositionalList
+from positionalList import Empty
+
+
+class PriorityQueueBase:
+    """Abstract base class for adaptable priority queues of (key, value) entries"""
+
+    class Locator:
+        """Token for an entry, returned by add() and accepted by update() and remove()"""
+        __slots__ = '_container', '_key', '_value'
+
+        def __init__(self, container, k, v):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._key = k
+            self._value = v
+
+        def key(self):
+            """Return the key of the entry"""
+            return self._key
+
+        def value(self):
+            """Return the value of the entry"""
+            return self._value
+
+        def __lt__(self, other):
+            return self._key < other._key
+
+    def is_empty(self):
+        """Return True if the priority queue is empty"""
+        return len(self) == 0
+
+    def _validate(self, loc):
+        """Raise appropriate error if loc is not a live locator of this priority queue"""
+        if not isinstance(loc, self.Locator):
+            raise TypeError('loc must be proper Locator type')
+        if loc._container is not self:
+            raise ValueError('loc is no longer valid')
+
+    @staticmethod
+    def _retire(loc):
+        """Invalidate loc and return its (key, value) pair"""
+        loc._container = None
+        return loc._key, loc._value
+
+
+class HeapPriorityQueue(PriorityQueueBase):
+    """An adaptable priority queue kept as a binary heap in a Python list
+
+    add, remove_min, update and remove take O(log n) time, min takes O(1).
+    """
+
+    class Locator(PriorityQueueBase.Locator):
+        __slots__ = '_index'
+
+    def __init__(self):
+        """Create an empty priority queue"""
+        self._data = []
+
+    def __len__(self):
+        """Return the number of entries in the priority queue"""
+        return len(self._data)
+
+    def _swap(self, i, j):
+        data = self._data
+        data[i], data[j] = data[j], data[i]
+        data[i]._index = i
+        data[j]._index = j
+
+    def _upheap(self, j):
+        parent = (j - 1) // 2
+        while j > 0 and self._data[j] < self._data[parent]:
+            self._swap(j, parent)
+            j, parent = parent, (parent - 1) // 2
+
+    def _downheap(self, j):
+        data = self._data
+        n = len(data)
+        while 2 * j + 1 < n:
+            small = 2 * j + 1
+            if small + 1 < n and data[small + 1] < data[small]:
+                small += 1
+            if not data[small] < data[j]:
+                break
+            self._swap(j, small)
+            j = small
+
+    def _bubble(self, j):
+        if j > 0 and self._data[j] < self._data[(j - 1) // 2]:
+            self._upheap(j)
+        else:
+            self._downheap(j)
+
+    def add(self, key, value):
+        """Add a key-value pair and return a Locator for it"""
+        loc = self.Locator(self, key, value)
+        loc._index = len(self._data)
+        self._data.append(loc)
+        self._upheap(loc._index)
+        return loc
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        loc = self._data[0]
+        return loc._key, loc._value
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        return self.remove(self._data[0])
+
+    def update(self, loc, new_key):
+        """Change the key of the entry identified by Locator loc"""
+        self._validate(loc)
+        loc._key = new_key
+        self._bubble(loc._index)
+
+    def remove(self, loc):
+        """Remove and return the (k,v) pair identified by Locator loc"""
+        self._validate(loc)
+        j = loc._index
+        if j != len(self._data) - 1:
+            self._swap(j, len(self._data) - 1)
+        self._data.pop()
+        if j < len(self._data):
+            self._bubble(j)
+        return self._retire(loc)
+
+
+class PairingHeapPriorityQueue(PriorityQueueBase):
+    """An adaptable priority queue kept as a pairing heap
+
+    add and decreasing a key take O(1) time, remove_min and remove take
+    amortized O(log n). Each node links to its first child, its next sibling
+    and back to its left sibling (or its parent if it is the first child).
+    """
+
+    class Locator(PriorityQueueBase.Locator):
+        __slots__ = '_child', '_sibling', '_prev'
+
+        def __init__(self, container, k, v):
+            super().__init__(container, k, v)
+            self._child = self._sibling = self._prev = None
+
+    def __init__(self):
+        """Create an empty priority queue"""
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        """Return the number of entries in the priority queue"""
+        return self._size
+
+    @staticmethod
+    def _meld(a, b):
+        """Return the root after linking the heaps rooted at a and b"""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b < a:
+            a, b = b, a
+        b._sibling = a._child
+        if a._child is not None:
+            a._child._prev = b
+        a._child = b
+        b._prev = a
+        return a
+
+    def _merge_pairs(self, first):
+        """Meld a list of sibling heaps starting at first in two passes and return the root"""
+        pairs = []
+        while first is not None:
+            a, b = first, first._sibling
+            if b is None:
+                a._prev = None
+                pairs.append(a)
+                break
+            first = b._sibling
+            a._prev = a._sibling = b._prev = b._sibling = None
+            pairs.append(self._meld(a, b))
+        root = pairs.pop() if pairs else None
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+    @staticmethod
+    def _detach(loc):
+        """Cut the subtree rooted at loc (which is not the root) out of the heap"""
+        if loc._prev._child is loc:
+            loc._prev._child = loc._sibling
+        else:
+            loc._prev._sibling = loc._sibling
+        if loc._sibling is not None:
+            loc._sibling._prev = loc._prev
+        loc._prev = loc._sibling = None
+
+    def _extract(self, loc):
+        """Remove loc from the heap, keeping its children in it"""
+        children = self._merge_pairs(loc._child)
+        loc._child = None
+        if loc is self._root:
+            self._root = children
+        else:
+            self._detach(loc)
+            self._root = self._meld(self._root, children)
+
+    def add(self, key, value):
+        """Add a key-value pair and return a Locator for it"""
+        loc = self.Locator(self, key, value)
+        self._root = self._meld(self._root, loc)
+        self._size += 1
+        return loc
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        return self._root._key, self._root._value
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        return self.remove(self._root)
+
+    def update(self, loc, new_key):
+        """Change the key of the entry identified by Locator loc"""
+        self._validate(loc)
+        decrease = new_key < loc._key
+        loc._key = new_key
+        if decrease:
+            if loc is not self._root:
+                self._detach(loc)
+                self._root = self._meld(self._root, loc)
+        else:
+            self._extract(loc)
+            self._root = self._meld(self._root, loc)
+
+    def remove(self, loc):
+        """Remove and return the (k,v) pair identified by Locator loc"""
+        self._validate(loc)
+        self._extract(loc)
+        self._size -= 1
+        return self._retire(loc)
+
+
+class SortedPriorityQueue(PriorityQueueBase):
+    """An adaptable priority queue kept as a PositionalList sorted by key
+
+    min and remove_min take O(1) time. add walks from the back and update
+    walks from the entry's old place, so both are fast when keys arrive in
+    nearly sorted order (such as timestamps) but O(n) in the worst case.
+    Entries with equal keys are removed in the order they were added.
+    """
+
+    class Locator(PriorityQueueBase.Locator):
+        __slots__ = '_position'
+
+    def __init__(self):
+        """Create an empty priority queue"""
+        self._data = PositionalList()
+
+    def __len__(self):
+        """Return the number of entries in the priority queue"""
+        return len(self._data)
+
+    def _insert_backward(self, loc, walk):
+        """Insert loc after the last position at or before walk whose key is not greater"""
+        while walk is not None and loc < walk.element():
+            walk = self._data.before(walk)
+        if walk is None:
+            loc._position = self._data.add_first(loc)
+        else:
+            loc._position = self._data.add_after(walk, loc)
+
+    def _insert_forward(self, loc, walk):
+        """Insert loc before the first position at or after walk whose key is greater"""
+        while walk is not None and not loc < walk.element():
+            walk = self._data.after(walk)
+        if walk is None:
+            loc._position = self._data.add_last(loc)
+        else:
+            loc._position = self._data.add_before(walk, loc)
+
+    def add(self, key, value):
+        """Add a key-value pair and return a Locator for it"""
+        loc = self.Locator(self, key, value)
+        self._insert_backward(loc, self._data.last())
+        return loc
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        loc = self._data.first().element()
+        return loc._key, loc._value
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key"""
+        if self.is_empty():
+            raise Empty("Priority queue is empty")
+        return self.remove(self._data.first().element())
+
+    def update(self, loc, new_key):
+        """Change the key of the entry identified by Locator loc"""
+        self._validate(loc)
+        before = self._data.before(loc._position)
+        after = self._data.after(loc._position)
+        self._data.delete(loc._position)
+        loc._key = new_key
+        if before is not None and loc < before.element():
+            self._insert_backward(loc, before)
+        else:
+            self._insert_forward(loc, after)
+
+    def remove(self, loc):
+        """Remove and return the (k,v) pair identified by Locator loc"""
+        self._validate(loc)
+        self._data.delete(loc._position)
+        loc._position = None
+        return self._retire(loc)
+
+
+if __name__ == '__main__':
+    import random
+    import unittest
+
+    class TestHeapPriorityQueue(unittest.TestCase):
+        cls = HeapPriorityQueue
+
+        def setUp(self):
+            self.pq = self.cls()
+
+        def test_add_remove_min(self):
+            with self.assertRaises(Empty):
+                self.pq.min()
+            keys = [random.randrange(100) for i in range(200)]
+            for k in keys:
+                self.pq.add(k, str(k))
+            self.assertTrue(len(self.pq) == 200 and self.pq.min()[0] == min(keys))
+            out = [self.pq.remove_min() for i in range(200)]
+            self.assertTrue(out == [(k, str(k)) for k in sorted(keys)])
+            self.assertTrue(self.pq.is_empty())
+
+        def test_update_remove(self):
+            reference = {}
+            locators = []
+            for i in range(300):
+                k = random.randrange(1000)
+                locators.append(self.pq.add(k, i))
+                reference[i] = k
+            for i in range(500):
+                loc = random.choice(locators)
+                if loc._container is None:
+                    continue
+                if i % 3 == 0:
+                    self.assertTrue(self.pq.remove(loc) == (reference.pop(loc.value()), loc.value()))
+                else:
+                    reference[loc.value()] = random.randrange(1000)
+                    self.pq.update(loc, reference[loc.value()])
+                    self.assertTrue(loc.key() == reference[loc.value()])
+            keys = [self.pq.remove_min()[0] for i in range(len(self.pq))]
+            self.assertTrue(keys == sorted(reference.values()))
+
+        def test_invalid_locator(self):
+            loc = self.pq.add(1, 'a')
+            self.pq.remove_min()
+            with self.assertRaises(ValueError):
+                self.pq.update(loc, 0)
+            with self.assertRaises(ValueError):
+                self.cls().remove(self.pq.add(2, 'b'))
+            with self.assertRaises(TypeError):
+                self.pq.remove((2, 'b'))
+
+    class TestPairingHeapPriorityQueue(TestHeapPriorityQueue):
+        cls = PairingHeapPriorityQueue
+
+    class TestSortedPriorityQueue(TestHeapPriorityQueue):
+        cls = SortedPriorityQueue
+
+        def test_fifo_ties(self):
+            for v in 'abcde':
+                self.pq.add(1, v)
+            loc = self.pq.add(2, 'f')
+            self.pq.update(loc, 1)
+            self.assertTrue([self.pq.remove_min()[1] for i in range(6)] == list('abcdef'))
+
+    unittest.main()
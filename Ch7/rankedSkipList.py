@@ -0,0 +1,144 @@
+import random
+
+
+class RankedSkipList:
+    """Indexable skip list holding hashable items in an order chosen by the caller
+
+    Items are placed next to a given neighbour instead of by comparing keys,
+    so the skip list can mirror the order of a linked list. Every link records
+    how many items it skips, which lets select(k) find the item of rank k and
+    rank(item) count the items before it, both in O(log n) expected time.
+    """
+    MAX_LEVEL = 32
+
+    class _Tower:
+        """Lightweight, nonpublic class storing the links of one item at each of its levels"""
+        __slots__ = '_item', '_next', '_prev', '_width'
+
+        def __init__(self, item, height):
+            """Create an unlinked tower"""
+            self._item = item
+            self._next = [None] * height
+            self._prev = [None] * height
+            self._width = [0] * height
+
+    def __init__(self):
+        """Create an empty skip list"""
+        self._head = self._Tower(None, RankedSkipList.MAX_LEVEL)
+        self._head._width = [1] * RankedSkipList.MAX_LEVEL
+        self._towers = {}
+
+    def __len__(self):
+        """Return the number of items in the skip list"""
+        return len(self._towers)
+
+    def __contains__(self, item):
+        """Return True if item is in the skip list"""
+        return item in self._towers
+
+    def _random_height(self):
+        """Return a tower height drawn from a geometric distribution"""
+        height = 1
+        while height < RankedSkipList.MAX_LEVEL and random.random() < 0.5:
+            height += 1
+        return height
+
+    def insert_after(self, predecessor, item):
+        """Insert item right after predecessor (or at the front if predecessor is None)"""
+        if item in self._towers:
+            raise ValueError("item is already in the skip list")
+        height = self._random_height()
+        tower = self._Tower(item, height)
+        walk = self._head if predecessor is None else self._towers[predecessor]
+        distance = 1
+
+        for level in range(RankedSkipList.MAX_LEVEL):
+            while len(walk._next) <= level:
+                top = len(walk._next) - 1
+                walk = walk._prev[top]
+                distance += walk._width[top]
+            if level < height:
+                successor = walk._next[level]
+                tower._next[level] = successor
+                tower._prev[level] = walk
+                tower._width[level] = walk._width[level] - distance + 1
+                walk._next[level] = tower
+                walk._width[level] = distance
+                if successor is not None:
+                    successor._prev[level] = tower
+            else:
+                walk._width[level] += 1
+
+        self._towers[item] = tower
+
+    def remove(self, item):
+        """Remove item from the skip list"""
+        tower = self._towers.pop(item)
+        height = len(tower._next)
+        for level in range(height):
+            predecessor = tower._prev[level]
+            successor = tower._next[level]
+            predecessor._next[level] = successor
+            predecessor._width[level] += tower._width[level] - 1
+            if successor is not None:
+                successor._prev[level] = predecessor
+
+        walk = tower._prev[height - 1]
+        for level in range(height, RankedSkipList.MAX_LEVEL):
+            while len(walk._next) <= level:
+                walk = walk._prev[len(walk._next) - 1]
+            walk._width[level] -= 1
+
+    def select(self, k):
+        """Return the item of rank k, counting from 0"""
+        if not 0 <= k < len(self._towers):
+            raise IndexError("rank out of range")
+        walk = self._head
+        position = -1
+        for level in range(RankedSkipList.MAX_LEVEL - 1, -1, -1):
+            while walk._next[level] is not None and position + walk._width[level] <= k:
+                position += walk._width[level]
+                walk = walk._next[level]
+        return walk._item
+
+    def rank(self, item):
+        """Return the number of items before item"""
+        walk = self._towers[item]
+        rank = -1
+        while walk is not self._head:
+            top = len(walk._next) - 1
+            walk = walk._prev[top]
+            rank += walk._width[top]
+        return rank
+
+
+if __name__ == '__main__':
+    import unittest
+
+    class TestRankedSkipList(unittest.TestCase):
+
+        def setUp(self):
+            self.sl = RankedSkipList()
+
+        def test_empty(self):
+            with self.assertRaises(IndexError):
+                self.sl.select(0)
+            with self.assertRaises(KeyError):
+                self.sl.rank(1)
+
+        def test_matches_list(self):
+            random.seed(7)
+            mirror = []
+            for i in range(2000):
+                if mirror and random.random() < 0.3:
+                    self.sl.remove(mirror.pop(random.randrange(len(mirror))))
+                else:
+                    k = random.randrange(len(mirror) + 1)
+                    self.sl.insert_after(mirror[k - 1] if k else None, i)
+                    mirror.insert(k, i)
+            self.assertTrue(len(self.sl) == len(mirror))
+            for k, item in enumerate(mirror):
+                self.assertTrue(self.sl.select(k) == item)
+                self.assertTrue(self.sl.rank(item) == k)
+
+    unittest.main()
@@ -0,0 +1,279 @@
+import contextlib
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+
+from arrayQueue import Empty
+from arrayQueue import Full
+
+
+class SharedRingQueue:
+    """FIFO queue of byte records in a ring of fixed-size slots held in shared memory
+
+    The layout follows ArrayQueue's circular array. A header holds two
+    ever-increasing 64-bit counters, head and tail. The front slot is
+    head % capacity and the size is tail - head. Each slot stores a 4-byte
+    length prefix followed by up to slot_size - 4 bytes of record. The
+    counters only change while a lock shared by every attached process is
+    held. Any process that unpickles the queue, or calls attach() with its
+    name, attaches to the same memory.
+    """
+    _HEADER = struct.Struct('QQ')
+    _LENGTH = struct.Struct('I')
+
+    def __init__(self, capacity=1024, slot_size=256, name=None, lock=None):
+        """Create a queue of capacity slots, each holding a record of up to slot_size - 4 bytes
+
+        A new shared memory block is allocated, called name if given.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if slot_size <= self._LENGTH.size:
+            raise ValueError("slot_size must exceed the 4-byte length prefix")
+        self._open(capacity, slot_size, name, lock, True)
+        self._counters[0] = self._counters[1] = 0
+
+    @classmethod
+    def attach(cls, name, capacity, slot_size, lock):
+        """Return a queue using the existing shared memory block called name
+
+        capacity, slot_size and lock must be those of the queue that created
+        the block.
+        """
+        q = cls.__new__(cls)
+        q._open(capacity, slot_size, name, lock, False)
+        return q
+
+    def _open(self, capacity, slot_size, name, lock, create):
+        """Create or attach to the shared memory block and map the counters"""
+        self._capacity = capacity
+        self._slot_size = slot_size
+        self._lock = lock if lock is not None else multiprocessing.Lock()
+        size = self._HEADER.size + capacity * slot_size
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._buf = self._shm.buf
+        self._counters = self._buf[:self._HEADER.size].cast('Q')
+
+    def __getstate__(self):
+        return self._shm.name, self._capacity, self._slot_size, self._lock
+
+    def __setstate__(self, state):
+        name, capacity, slot_size, lock = state
+        self._open(capacity, slot_size, name, lock, False)
+
+    def __len__(self):
+        """Return the number of records in the queue"""
+        with self._lock:
+            return self._counters[1] - self._counters[0]
+
+    @property
+    def name(self):
+        """Name of the shared memory block, for attaching from another process"""
+        return self._shm.name
+
+    def is_empty(self):
+        """Return True if queue is empty"""
+        return len(self) == 0
+
+    def _slot(self, counter):
+        """Return the byte offset of the slot used by the record numbered counter"""
+        return self._HEADER.size + (counter % self._capacity) * self._slot_size
+
+    def _write(self, counter, record):
+        """Copy record into the slot for counter"""
+        n = len(record)
+        if n > self._slot_size - self._LENGTH.size:
+            raise ValueError("record of {} bytes does not fit in a slot".format(n))
+        offset = self._slot(counter)
+        self._LENGTH.pack_into(self._buf, offset, n)
+        start = offset + self._LENGTH.size
+        self._buf[start:start + n] = record
+
+    def _view(self, counter):
+        """Return a memoryview of the record stored in the slot for counter"""
+        offset = self._slot(counter)
+        n = self._LENGTH.unpack_from(self._buf, offset)[0]
+        start = offset + self._LENGTH.size
+        return self._buf[start:start + n]
+
+    def enqueue(self, record):
+        """Add a bytes-like record to the back of the queue, raising Full if every slot is taken"""
+        with self._lock:
+            head, tail = self._counters
+            if tail - head == self._capacity:
+                raise Full("Queue is full")
+            self._write(tail, record)
+            self._counters[1] = tail + 1
+
+    def enqueue_many(self, records):
+        """Add as many records as fit under one lock acquisition and return how many were added
+
+        If a record does not fit in a slot, the records before it stay
+        queued and ValueError is raised.
+        """
+        count = 0
+        with self._lock:
+            head, tail = self._counters
+            try:
+                for record in records:
+                    if tail - head == self._capacity:
+                        break
+                    self._write(tail, record)
+                    tail += 1
+                    count += 1
+            finally:
+                self._counters[1] = tail
+        return count
+
+    def first(self):
+        """Return a zero-copy memoryview of the front record without removing it
+
+        The view stays valid only until the record is dequeued and must be
+        released before the queue is closed.
+        """
+        with self._lock:
+            head, tail = self._counters
+            if head == tail:
+                raise Empty("Queue is empty")
+            return self._view(head)
+
+    @contextlib.contextmanager
+    def consume(self):
+        """Context manager removing the front record and giving a zero-copy memoryview of it
+
+        The lock is held for the whole with block, so other producers and
+        consumers wait and the block must not call back into the queue. The
+        view is released and the record removed when the block exits; if the
+        block raises, the record stays at the front.
+        """
+        with self._lock:
+            head, tail = self._counters
+            if head == tail:
+                raise Empty("Queue is empty")
+            view = self._view(head)
+            try:
+                yield view
+            finally:
+                view.release()
+            self._counters[0] = head + 1
+
+    def dequeue(self):
+        """Remove and return the front record as bytes
+
+        The record is copied out of its slot, which producers may reuse as
+        soon as the lock is released; consume() avoids the copy.
+        """
+        with self._lock:
+            head, tail = self._counters
+            if head == tail:
+                raise Empty("Queue is empty")
+            with self._view(head) as view:
+                record = bytes(view)
+            self._counters[0] = head + 1
+            return record
+
+    def dequeue_many(self, n):
+        """Remove and return a list of up to n records under one lock acquisition
+
+        Each record is copied to bytes, as in dequeue().
+        """
+        records = []
+        with self._lock:
+            head, tail = self._counters
+            for counter in range(head, min(tail, head + n)):
+                with self._view(counter) as view:
+                    records.append(bytes(view))
+            self._counters[0] = head + len(records)
+        return records
+
+    def close(self):
+        """Detach this process from the shared memory"""
+        self._counters.release()
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """Destroy the shared memory block once every process has closed it"""
+        self._shm.unlink()
+
+
+if __name__ == '__main__':
+    import unittest
+
+    def produce(q, start, count):
+        for i in range(start, start + count):
+            while True:
+                try:
+                    q.enqueue(str(i).encode())
+                    break
+                except Full:
+                    pass
+        q.close()
+
+    class TestSharedRingQueue(unittest.TestCase):
+
+        def setUp(self):
+            self.q = SharedRingQueue(capacity=4, slot_size=16)
+
+        def tearDown(self):
+            self.q.close()
+            self.q.unlink()
+
+        def test_fifo(self):
+            with self.assertRaises(Empty):
+                self.q.dequeue()
+            for i in range(4):
+                self.q.enqueue(bytes([i]) * i)
+            with self.assertRaises(Full):
+                self.q.enqueue(b'x')
+            self.assertTrue(self.q.dequeue() == b'')
+            with self.assertRaises(ValueError):
+                self.q.enqueue(b'y' * 13)
+            self.q.enqueue(b'wrap')
+            with self.q.first() as view:
+                self.assertTrue(view == b'\x01')
+            self.assertTrue(self.q.dequeue_many(10) == [b'\x01', b'\x02\x02', b'\x03\x03\x03', b'wrap'])
+            self.assertTrue(self.q.enqueue_many([b'a', b'b', b'c', b'd', b'e']) == 4)
+            self.assertTrue(len(self.q) == 4)
+
+        def test_consume(self):
+            with self.assertRaises(Empty):
+                with self.q.consume():
+                    pass
+            self.q.enqueue_many([b'abc', b'de'])
+            with self.q.consume() as view:
+                self.assertTrue(view == b'abc')
+            self.assertTrue(len(self.q) == 1)
+            with self.assertRaises(ValueError):
+                view.tobytes()
+            with self.assertRaises(KeyError):
+                with self.q.consume() as view:
+                    raise KeyError
+            with self.q.consume() as view:
+                self.assertTrue(view.tobytes() == b'de')
+            self.assertTrue(self.q.is_empty())
+
+        def test_attach(self):
+            other = SharedRingQueue.attach(self.q.name, 4, 16, self.q._lock)
+            self.q.enqueue(b'x')
+            self.assertTrue(other.dequeue() == b'x' and self.q.is_empty())
+            other.close()
+
+        def test_oversized_in_batch(self):
+            with self.assertRaises(ValueError):
+                self.q.enqueue_many([b'a', b'b', b'y' * 13, b'c'])
+            self.assertTrue(self.q.dequeue_many(10) == [b'a', b'b'])
+
+        def test_processes(self):
+            producers = [multiprocessing.Process(target=produce, args=(self.q, i * 100, 100))
+                         for i in range(3)]
+            for p in producers:
+                p.start()
+            received = []
+            while len(received) < 300:
+                received.extend(int(r) for r in self.q.dequeue_many(8))
+            for p in producers:
+                p.join()
+            self.assertTrue(sorted(received) == list(range(300)))
+
+    unittest.main()
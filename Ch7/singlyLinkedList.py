@@ -1,11 +1,15 @@
+from instrumentation import Instrumented
+
+
 class Empty(Exception):
     pass
 
 
-class linkedStack:
+class linkedStack(Instrumented):
     """Complete implementation of the stack ADT using a singly linked list that includes
        a header sentinel.
     """
+    _INSTRUMENTED = ('push', 'pop', 'first')
     class _Node:
         """Lightweight Node class"""
         __slots__ = '_data', '_next'
@@ -68,8 +72,9 @@ class linkedStack:
         return self._header._next._data
 
 
-class linkedQueue:
+class linkedQueue(Instrumented):
     """A FILO queue using a linked list data structure that includes a header sentinel"""
+    _INSTRUMENTED = ('enqueue', 'dequeue', 'first', 'last', 'enqueue_many', 'dequeue_many', 'concatenate')
     class _Node:
         """Non-public lightweight Node class"""
         __slots__ = '_data', '_next'
@@ -79,11 +84,12 @@ class linkedQueue:
             self._data = data
             self._next = next
 
-    def __init__(self):
-        """Create an empty linked list queue"""
+    def __init__(self, pool=None):
+        """Create an empty linked list queue, optionally recycling nodes through a NodePool"""
         self._trailer = None
         self._header = self._Node(None, None)
         self._size = 0
+        self._pool = pool
 
     def __len__(self):
         """Return the number of element in the linked queue"""
@@ -107,7 +113,11 @@ class linkedQueue:
 
     def enqueue(self, e):
         """Add element e to the back of the queue"""
-        new = self._Node(e, None)
+        new = self._pool.get() if self._pool is not None else None
+        if new is None:
+            new = self._Node(e, None)
+        else:
+            new._data, new._next = e, None
         if self.is_empty():
             self._header._next = new
         else:
@@ -123,11 +133,54 @@ class linkedQueue:
         self._size -= 1
         self._header._next = e._next
 
-        if self._size == 1:
+        if self.is_empty():
             self._trailer = None
 
+        data = e._data
         e._next = None
-        return e._data
+        if self._pool is not None:
+            e._data = None
+            self._pool.put(e)
+        return data
+
+    def enqueue_many(self, elements):
+        """Add all elements of an iterable to the back of the queue"""
+        Node = self._Node
+        first = last = Node(None, None)
+        count = 0
+        for e in elements:
+            last._next = Node(e, None)
+            last = last._next
+            count += 1
+        if count == 0:
+            return
+
+        if self.is_empty():
+            self._header._next = first._next
+        else:
+            self._trailer._next = first._next
+        self._trailer = last
+        self._size += count
+
+    def dequeue_many(self, n):
+        """Return a list of up to n elements from the front of the queue"""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        n = min(n, self._size)
+        elems = []
+        walk = self._header._next
+        for k in range(n):
+            elems.append(walk._data)
+            old, walk = walk, walk._next
+            if self._pool is not None:
+                old._data = old._next = None
+                self._pool.put(old)
+        self._header._next = walk
+        self._size -= n
+
+        if self.is_empty():
+            self._trailer = None
+        return elems
 
     def first(self):
         """Return (but do not remove) the first element in the queue"""
@@ -1,9 +1,13 @@
+from instrumentation import Instrumented
+
+
 class Empty(Exception):
     pass
 
 
-class LinkedStack:
+class LinkedStack(Instrumented):
     """LIFO Stack implementation using a linked list"""
+    _INSTRUMENTED = ('push', 'pop', 'top')
 
     class _Node:
         """Lightweight, non-public class for storing a singly linked node"""
@@ -14,12 +18,13 @@ class LinkedStack:
             self._data = data
             self._next = next
 
-    def __init__(self):
-        """Create an empty stack"""
+    def __init__(self, pool=None):
+        """Create an empty stack, optionally recycling nodes through a NodePool"""
         self._head = None
         self._size = 0
+        self._pool = pool
 
-    def _len(self):
+    def __len__(self):
         """Return number of elements in the linked stack"""
         return self._size
 
@@ -29,7 +34,12 @@ class LinkedStack:
 
     def push(self, e):
         """Push an element e to the top of the stack"""
-        self._head = self._Node(e, self._head)
+        node = self._pool.get() if self._pool is not None else None
+        if node is None:
+            self._head = self._Node(e, self._head)
+        else:
+            node._data, node._next = e, self._head
+            self._head = node
         self._size += 1
 
     def top(self):
@@ -42,28 +52,39 @@ class LinkedStack:
         """Pop the element off the top of the stack"""
         if self.is_empty():
             raise Empty("Stack is empty")
-        top = self._head._data
-        self._head = self._head._next
+        old = self._head
+        top = old._data
+        self._head = old._next
         self._size -= 1
+
+        if self._pool is not None:
+            old._data = old._next = None
+            self._pool.put(old)
         return top
 
 
-class LinkedQueue:
+class LinkedQueue(Instrumented):
     """FIFO Queue ADT using a linked list internal data structure"""
+    _INSTRUMENTED = ('enqueue', 'dequeue', 'front', 'back', 'enqueue_many', 'dequeue_many', 'rotate')
     class _Node:
         """Lightweight, non-public class for storing a singly linked list"""
         __slots__ = '_data', '_next'
 
-        def __init__(self, data):
+        def __init__(self, data, next=None):
             """Create an empty node"""
             self._data = data
             self._next = next
 
-    def __init__(self):
-        """Create an empty linked queue"""
+    def __init__(self, pool=None):
+        """Create an empty linked queue, optionally recycling nodes through a NodePool"""
         self._head = None
         self._tail = None
         self._size = 0
+        self._pool = pool
+
+    def __len__(self):
+        """Return the number of elements in the queue"""
+        return self._size
 
     def is_empty(self):
         """Return True if the queue is empty"""
@@ -71,7 +92,11 @@ class LinkedQueue:
 
     def enqueue(self, e):
         """Add an element e to the tail of the queue"""
-        new = self._Node(e)
+        new = self._pool.get() if self._pool is not None else None
+        if new is None:
+            new = self._Node(e)
+        else:
+            new._data, new._next = e, None
 
         if self.is_empty():
             self._head = new
@@ -97,14 +122,57 @@ class LinkedQueue:
         """Remove element e from the front of the queue"""
         if self.is_empty():
             raise Empty("Queue is empty")
-        e = self._head._data
+        old = self._head
+        e = old._data
         self._size -= 1
-        self._head = self._head._next
+        self._head = old._next
 
         if self.is_empty():
             self._tail = None
+        if self._pool is not None:
+            old._data = old._next = None
+            self._pool.put(old)
         return e
 
+    def enqueue_many(self, elements):
+        """Add all elements of an iterable to the tail of the queue"""
+        Node = self._Node
+        first = last = Node(None)
+        count = 0
+        for e in elements:
+            last._next = Node(e)
+            last = last._next
+            count += 1
+        if count == 0:
+            return
+
+        if self.is_empty():
+            self._head = first._next
+        else:
+            self._tail._next = first._next
+        self._tail = last
+        self._size += count
+
+    def dequeue_many(self, n):
+        """Remove and return a list of up to n elements from the front of the queue"""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        n = min(n, self._size)
+        elems = []
+        walk = self._head
+        for k in range(n):
+            elems.append(walk._data)
+            old, walk = walk, walk._next
+            if self._pool is not None:
+                old._data = old._next = None
+                self._pool.put(old)
+        self._head = walk
+        self._size -= n
+
+        if self.is_empty():
+            self._tail = None
+        return elems
+
     def rotate(self):
         """Rotate an element e from the front of the queue to the back"""
         if self.is_empty():
@@ -114,6 +182,7 @@ class LinkedQueue:
 
 if __name__ == '__main__':
     import unittest
+    from nodePool import NodePool
 
     class TestLinkedStack(unittest.TestCase):
 
@@ -159,6 +228,18 @@ if __name__ == '__main__':
             with self.assertRaises(Empty):
                 self.ls.pop()
 
+        def test_node_pool(self):
+            pool = NodePool(4)
+            self.ls = LinkedStack(pool)
+            for i in range(10):
+                self.ls.push(i)
+            for i in range(9, -1, -1):
+                self.assertTrue(self.ls.pop() == i)
+            for i in range(3):
+                self.ls.push(i)
+            self.assertTrue(self.ls.top() == 2)
+            self.assertTrue(pool.hits == 3 and pool.misses == 10 and len(pool) == 1)
+
 
     class TestLinkedQueue(unittest.TestCase):
         """Test the Linked Queue class"""
@@ -204,4 +285,31 @@ if __name__ == '__main__':
             with self.assertRaises(Empty):
                 self.lq.dequeue()
 
+        def test_bulk(self):
+            """Test adding and removing runs of elements"""
+            self.lq.enqueue_many([])
+            self.assertTrue(self.lq.is_empty())
+            self.lq.enqueue(0)
+            self.lq.enqueue_many(range(1, 10))
+            self.assertTrue(self.lq.front() == 0 and self.lq.back() == 9)
+            self.assertTrue(self.lq.dequeue_many(4) == [0, 1, 2, 3])
+            with self.assertRaises(ValueError):
+                self.lq.dequeue_many(-1)
+            self.assertTrue(self.lq.dequeue_many(10) == [4, 5, 6, 7, 8, 9])
+            self.assertTrue(self.lq.is_empty())
+            self.lq.enqueue_many(range(3))
+            self.assertTrue(self.lq.front() == 0 and self.lq.back() == 2)
+
+        def test_node_pool(self):
+            """Test recycling dequeued nodes"""
+            pool = NodePool()
+            self.lq = LinkedQueue(pool)
+            self.lq.enqueue_many(range(5))
+            self.lq.dequeue_many(3)
+            self.lq.dequeue()
+            for i in range(5, 9):
+                self.lq.enqueue(i)
+            self.assertTrue(pool.hits == 4 and len(pool) == 0)
+            self.assertTrue(self.lq.dequeue_many(5) == [4, 5, 6, 7, 8])
+
     unittest.main()
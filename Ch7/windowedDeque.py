@@ -0,0 +1,204 @@
+import time
+
+from doubleLinkedList import _DoublyLinkedBase
+from doubleLinkedList import LinkedDeque
+from doubleLinkedList import Empty
+
+
+class WindowedDeque(_DoublyLinkedBase):
+    """A sliding window over a stream of numbers with O(1) aggregates
+
+    The window keeps the last size values, the values pushed during the last
+    duration seconds, or both. Values enter at the back and leave from the
+    front. Two monotonic deques of (sequence number, value) pairs give the
+    window minimum and maximum in amortized O(1) time, and the mean and
+    variance are updated incrementally on every push and eviction.
+    """
+    _INSTRUMENTED = ('push', 'push_many', 'advance')
+
+    def __init__(self, size=None, duration=None, clock=time.monotonic):
+        """Create an empty window bounded by a count, a duration in seconds of clock, or both"""
+        if size is None and duration is None:
+            raise ValueError("a window needs a size or a duration")
+        if size is not None and size <= 0:
+            raise ValueError("size must be positive")
+        super().__init__()
+        self._window_size = size
+        self._duration = duration
+        self._clock = clock
+        self._times = LinkedDeque() if duration is not None else None
+        self._mins = LinkedDeque()
+        self._maxs = LinkedDeque()
+        self._pushed = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __iter__(self):
+        """Generate the values in the window from oldest to newest"""
+        return self._iter_elements()
+
+    def first(self):
+        """Return the oldest value in the window"""
+        if self.is_empty():
+            raise Empty("Window is empty")
+        return self._element_of(self._next_of(self._header))
+
+    def last(self):
+        """Return the newest value in the window"""
+        if self.is_empty():
+            raise Empty("Window is empty")
+        return self._element_of(self._prev_of(self._trailer))
+
+    # ----------------- ingestion ----------------- #
+    def _append(self, value, timestamp):
+        """Add value at the back of the window and fold it into the aggregates"""
+        seq = self._pushed
+        self._pushed += 1
+        self._insert_between(value, self._prev_of(self._trailer), self._trailer)
+        if self._times is not None:
+            self._times.insert_last(timestamp)
+
+        while not self._mins.is_empty() and self._mins.last()[1] > value:
+            self._mins.delete_last()
+        self._mins.insert_last((seq, value))
+        while not self._maxs.is_empty() and self._maxs.last()[1] < value:
+            self._maxs.delete_last()
+        self._maxs.insert_last((seq, value))
+
+        delta = value - self._mean
+        self._mean += delta / self._size
+        self._m2 += delta * (value - self._mean)
+
+    def _evict(self):
+        """Remove the oldest value from the window and the aggregates"""
+        seq = self._pushed - self._size
+        value = self._delete_node(self._next_of(self._header))
+        if self._times is not None:
+            self._times.delete_first()
+        if self._mins.first()[0] == seq:
+            self._mins.delete_first()
+        if self._maxs.first()[0] == seq:
+            self._maxs.delete_first()
+
+        if self._size == 0:
+            self._mean = self._m2 = 0.0
+        else:
+            delta = value - self._mean
+            self._mean -= delta / self._size
+            self._m2 -= delta * (value - self._mean)
+        return value
+
+    def advance(self, now=None):
+        """Evict the values older than duration seconds before now (default clock())"""
+        if self._duration is None:
+            return
+        if now is None:
+            now = self._clock()
+        cutoff = now - self._duration
+        while self._size and self._times.first() <= cutoff:
+            self._evict()
+
+    def push(self, value, timestamp=None):
+        """Add value to the window, timestamped now unless timestamp is given"""
+        if self._duration is not None and timestamp is None:
+            timestamp = self._clock()
+        self._append(value, timestamp)
+        if self._window_size is not None and self._size > self._window_size:
+            self._evict()
+        self.advance(timestamp)
+
+    def push_many(self, values, timestamp=None):
+        """Add every value of an iterable with one shared timestamp
+
+        With a count window, values that would be evicted within the same
+        batch are skipped rather than pushed and evicted one by one.
+        """
+        values = list(values)
+        if self._window_size is not None and len(values) >= self._window_size:
+            while self._size:
+                self._evict()
+            skipped = len(values) - self._window_size
+            self._pushed += skipped
+            values = values[skipped:]
+        if self._duration is not None and timestamp is None:
+            timestamp = self._clock()
+        for value in values:
+            self._append(value, timestamp)
+        if self._window_size is not None:
+            while self._size > self._window_size:
+                self._evict()
+        self.advance(timestamp)
+
+    # ----------------- aggregates ----------------- #
+    def window_min(self):
+        """Return the smallest value in the window"""
+        if self.is_empty():
+            raise Empty("Window is empty")
+        return self._mins.first()[1]
+
+    def window_max(self):
+        """Return the largest value in the window"""
+        if self.is_empty():
+            raise Empty("Window is empty")
+        return self._maxs.first()[1]
+
+    def mean(self):
+        """Return the arithmetic mean of the window"""
+        if self.is_empty():
+            raise Empty("Window is empty")
+        return self._mean
+
+    def variance(self, ddof=0):
+        """Return the population variance of the window (sample variance with ddof=1)"""
+        if self._size <= ddof:
+            raise Empty("Window has too few values")
+        return max(self._m2, 0.0) / (self._size - ddof)
+
+
+if __name__ == '__main__':
+    import random
+    import statistics
+    import unittest
+
+    class TestWindowedDeque(unittest.TestCase):
+
+        def test_count_window(self):
+            w = WindowedDeque(size=50)
+            with self.assertRaises(Empty):
+                w.window_min()
+            values = [random.uniform(-100, 100) for i in range(500)]
+            for i, v in enumerate(values):
+                w.push(v)
+                window = values[max(0, i - 49):i + 1]
+                self.assertTrue(w.window_min() == min(window) and w.window_max() == max(window))
+                self.assertAlmostEqual(w.mean(), statistics.fmean(window))
+                if len(window) > 1:
+                    self.assertAlmostEqual(w.variance(), statistics.pvariance(window))
+                    self.assertAlmostEqual(w.variance(ddof=1), statistics.variance(window))
+            self.assertTrue(list(w) == values[-50:] and w.first() == values[-50])
+
+        def test_time_window(self):
+            w = WindowedDeque(duration=10)
+            for t in range(20):
+                w.push(t % 7, timestamp=t)
+            self.assertTrue(list(w) == [3, 4, 5, 6, 0, 1, 2, 3, 4, 5])
+            self.assertTrue(w.window_max() == 6 and w.window_min() == 0)
+            self.assertAlmostEqual(w.mean(), 3.3)
+            w.advance(25)
+            self.assertTrue(list(w) == [2, 3, 4, 5])
+            w.advance(30)
+            self.assertTrue(w.is_empty())
+
+        def test_push_many(self):
+            w = WindowedDeque(size=5, duration=100, clock=lambda: 0)
+            w.push_many([5, 1, 4])
+            w.push_many(range(10, 2, -1))
+            self.assertTrue(list(w) == [7, 6, 5, 4, 3] and w.last() == 3)
+            self.assertTrue((w.window_min(), w.window_max(), w.mean()) == (3, 7, 5))
+            w.push_many([9, 8])
+            self.assertTrue(list(w) == [5, 4, 3, 9, 8] and w.window_max() == 9)
+            self.assertAlmostEqual(w.variance(), statistics.pvariance([5, 4, 3, 9, 8]))
+            w.push_many([1], timestamp=200)
+            self.assertTrue(list(w) == [1] and w.window_min() == 1)
+
+    unittest.main()
@@ -0,0 +1,36 @@
+"""Per-operation latency of ArrayQueue enqueue/dequeue as the queue grows.
+
+Usage: python benchmarks/arrayQueueBenchmark.py [max_exponent]
+
+The amortized cost per operation should stay flat from 10^3 up to
+10^max_exponent elements (default 7).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from arrayQueue import ArrayQueue
+
+
+def bench(n):
+    """Return (enqueue ns/op, dequeue ns/op) for n elements"""
+    q = ArrayQueue()
+    start = time.perf_counter()
+    for i in range(n):
+        q.enqueue(i)
+    middle = time.perf_counter()
+    for i in range(n):
+        q.dequeue()
+    end = time.perf_counter()
+    return (middle - start) * 1e9 / n, (end - middle) * 1e9 / n
+
+
+if __name__ == '__main__':
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    print("{:>10} {:>14} {:>14}".format("n", "enqueue ns/op", "dequeue ns/op"))
+    for k in range(3, max_exponent + 1):
+        n = 10 ** k
+        enq, deq = bench(n)
+        print("{:>10} {:>14.1f} {:>14.1f}".format(n, enq, deq))
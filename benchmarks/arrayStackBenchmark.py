@@ -0,0 +1,64 @@
+"""Compare ArrayStack with both linked stacks on push-then-pop workloads.
+
+Usage: python benchmarks/arrayStackBenchmark.py [max_exponent]
+
+n elements are pushed one at a time and then popped one at a time, for n
+from 10^2 to 10^max_exponent (default 6; 7 reproduces a deep DFS). The
+batched column pushes and pops the same elements in batches of BATCH with
+push_many/pop_many. A plain list is the baseline.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from arrayStack import ArrayStack
+from singlyLinkedList import linkedStack
+from singlyLinkedLists import LinkedStack
+
+BATCH = 1024
+
+
+def push_pop(stack, n):
+    """Return the seconds taken to push and then pop n elements"""
+    push = stack.push
+    pop = stack.pop
+    start = time.perf_counter()
+    for i in range(n):
+        push(i)
+    for i in range(n):
+        pop()
+    return time.perf_counter() - start
+
+
+def batched(stack, n):
+    """Return the seconds taken to push and then pop n elements in batches"""
+    start = time.perf_counter()
+    for i in range(0, n, BATCH):
+        stack.push_many(range(i, min(i + BATCH, n)))
+    while not stack.is_empty():
+        stack.pop_many(BATCH)
+    return time.perf_counter() - start
+
+
+def list_push_pop(n):
+    """Return the seconds taken by the same workload on a list"""
+    L = []
+    start = time.perf_counter()
+    for i in range(n):
+        L.append(i)
+    for i in range(n):
+        L.pop()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    print("{:>10} {:>13} {:>13} {:>13} {:>13} {:>13} {:>10}".format(
+        "n", "LinkedStack s", "linkedStack s", "ArrayStack s", "typed 'q' s", "batched s", "list s"))
+    for k in range(2, max_exponent + 1):
+        n = 10 ** k
+        print("{:>10} {:>13.4f} {:>13.4f} {:>13.4f} {:>13.4f} {:>13.4f} {:>10.4f}".format(
+            n, push_pop(LinkedStack(), n), push_pop(linkedStack(), n), push_pop(ArrayStack(), n),
+            push_pop(ArrayStack('q'), n), batched(ArrayStack(), n), list_push_pop(n)))
@@ -0,0 +1,69 @@
+"""Throughput of the thread-safe queues against queue.Queue.
+
+Usage: python benchmarks/concurrentQueueBenchmark.py [items]
+
+For 1, 2, 4, 8 and 16 producer/consumer thread pairs, every producer puts
+its share of items (default 200000 in total) into a bounded queue while the
+consumers drain it, either one get() at a time or with get_many batches.
+"""
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from concurrentQueue import ConcurrentArrayQueue, ConcurrentLinkedQueue
+
+MAXSIZE = 1024
+BATCH = 256
+THREADS = (1, 2, 4, 8, 16)
+
+
+def run(q, pairs, items, batched):
+    """Return items per second moved through q by pairs producer/consumer threads"""
+    share = items // pairs
+    stop = object()
+
+    def produce():
+        for i in range(share):
+            q.put(i)
+        q.put(stop)
+
+    def consume():
+        if batched:
+            while True:
+                stops = sum(1 for e in q.get_many(BATCH) if e is stop)
+                if stops:
+                    # hand back the stop markers meant for other consumers
+                    for i in range(stops - 1):
+                        q.put(stop)
+                    return
+        else:
+            while q.get() is not stop:
+                pass
+
+    threads = [threading.Thread(target=produce) for i in range(pairs)]
+    threads += [threading.Thread(target=consume) for i in range(pairs)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return share * pairs / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    variants = [
+        ("queue.Queue", lambda: queue.Queue(MAXSIZE), False),
+        ("ConcurrentArrayQueue", lambda: ConcurrentArrayQueue(MAXSIZE), False),
+        ("ConcurrentLinkedQueue", lambda: ConcurrentLinkedQueue(MAXSIZE), False),
+        ("ConcurrentArrayQueue get_many", lambda: ConcurrentArrayQueue(MAXSIZE), True),
+        ("ConcurrentLinkedQueue get_many", lambda: ConcurrentLinkedQueue(MAXSIZE), True),
+    ]
+    print("{:<32}".format("items/s") + "".join("{:>12}".format("{} pairs".format(p)) for p in THREADS))
+    for name, factory, batched in variants:
+        rates = [run(factory(), pairs, items, batched) for pairs in THREADS]
+        print("{:<32}".format(name) + "".join("{:>12.0f}".format(r) for r in rates))
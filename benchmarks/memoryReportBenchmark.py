@@ -0,0 +1,48 @@
+"""Compare the memory cost of the Ch7 backends with memory_report.
+
+Usage: python benchmarks/memoryReportBenchmark.py [exponent]
+
+Each container is filled with 10^exponent (default 6) distinct floats. The
+table shows bytes per element for the structure alone and including the
+elements, the ratio to a plain list and the bytes tracemalloc saw allocated
+while filling it.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from arrayQueue import ArrayQueue
+from arrayStack import ArrayStack
+from circularlyLinkedList import CircularQueue
+from doubleLinkedList import LinkedDeque, ArrayLinkedDeque, UnrolledLinkedDeque
+from memoryReport import memory_report
+from positionalList import PositionalList, ArrayPositionalList
+from singlyLinkedLists import LinkedQueue
+
+CONTAINERS = (
+    (PositionalList, PositionalList.add_last),
+    (ArrayPositionalList, ArrayPositionalList.add_last),
+    (LinkedDeque, LinkedDeque.insert_last),
+    (ArrayLinkedDeque, ArrayLinkedDeque.insert_last),
+    (UnrolledLinkedDeque, UnrolledLinkedDeque.insert_last),
+    (LinkedQueue, LinkedQueue.enqueue),
+    (CircularQueue, CircularQueue.enqueue),
+    (ArrayQueue, ArrayQueue.enqueue),
+    (ArrayStack, ArrayStack.push),
+)
+
+
+if __name__ == '__main__':
+    exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    n = 10 ** exponent
+    print("{:>20} {:>14} {:>14} {:>10} {:>16}".format(
+        "container", "shallow B/elt", "deep B/elt", "x list", "allocated B/elt"))
+    for cls, add in CONTAINERS:
+        def fill(container):
+            for i in range(n):
+                add(container, i + 0.5)
+        report = memory_report(cls(), workload=fill)
+        print("{:>20} {:>14.1f} {:>14.1f} {:>10.2f} {:>16.1f}".format(
+            cls.__name__, report['shallow_bytes'] / n, report['deep_bytes'] / n,
+            report['overhead_ratio'], report['tracemalloc']['size_diff'] / n))
@@ -0,0 +1,49 @@
+"""Compare PositionalList.sort with the insertion_sort function on random data.
+
+Usage: python benchmarks/positionalListSortBenchmark.py [max_exponent]
+
+insertion_sort is quadratic, so it is only timed up to 10^3 elements;
+PositionalList.sort runs up to 10^max_exponent (default 6).
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from positionalList import PositionalList, ArrayPositionalList, insertion_sort
+
+INSERTION_SORT_LIMIT = 10 ** 3
+
+
+def build(cls, data):
+    """Return a new list of type cls holding data"""
+    L = cls()
+    for e in data:
+        L.add_last(e)
+    return L
+
+
+def bench(sort, cls, data):
+    """Return the seconds taken by sort on a fresh list of type cls holding data"""
+    L = build(cls, data)
+    start = time.perf_counter()
+    sort(L)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    random.seed(0)
+    print("{:>10} {:>16} {:>16} {:>16}".format("n", "insertion_sort s", "sort s", "array sort s"))
+    for k in range(2, max_exponent + 1):
+        n = 10 ** k
+        data = [random.random() for i in range(n)]
+        if n <= INSERTION_SORT_LIMIT:
+            insertion = "{:.4f}".format(bench(insertion_sort, PositionalList, data))
+        else:
+            insertion = "-"
+        merge = bench(PositionalList.sort, PositionalList, data)
+        array_merge = bench(ArrayPositionalList.sort, ArrayPositionalList, data)
+        print("{:>10} {:>16} {:>16.4f} {:>16.4f}".format(n, insertion, merge, array_merge))
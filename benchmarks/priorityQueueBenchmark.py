@@ -0,0 +1,71 @@
+"""Compare the priority queue variants on three scheduler-like workloads.
+
+Usage: python benchmarks/priorityQueueBenchmark.py [max_exponent]
+
+random     n adds with random keys, then n remove_min calls
+timestamps n adds with increasing keys (slightly jittered), then n remove_min calls
+decrease   n adds, then n updates that lower a random key, then n remove_min calls
+
+SortedPriorityQueue is linear per operation on random keys, so it is only
+timed up to 10^3 entries there. On nearly sorted timestamps its adds are
+O(1) and it beats the binary heap, while the pairing heap, with O(1) adds and
+decrease-key, is fastest on the timestamp and decrease workloads.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from priorityQueue import HeapPriorityQueue, PairingHeapPriorityQueue, SortedPriorityQueue
+
+SORTED_LIMIT = 10 ** 3
+VARIANTS = (HeapPriorityQueue, PairingHeapPriorityQueue, SortedPriorityQueue)
+
+
+def random_keys(n):
+    """Return workload arguments with uniformly random keys"""
+    return [random.random() for i in range(n)], None
+
+
+def timestamp_keys(n):
+    """Return workload arguments with keys that arrive almost in order"""
+    return [i + random.random() * 4 for i in range(n)], None
+
+
+def decrease_keys(n):
+    """Return workload arguments with random keys and n key decreases"""
+    keys = [random.random() for i in range(n)]
+    return keys, [(random.randrange(n), random.random()) for i in range(n)]
+
+
+def run(cls, keys, updates):
+    """Return the seconds taken to run the workload on a new cls instance"""
+    start = time.perf_counter()
+    pq = cls()
+    locators = [pq.add(k, None) for k in keys]
+    if updates is not None:
+        for i, fraction in updates:
+            loc = locators[i]
+            pq.update(loc, loc.key() * fraction)
+    while not pq.is_empty():
+        pq.remove_min()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    random.seed(0)
+    print("{:>10} {:>10} {:>12} {:>12} {:>12}".format("workload", "n", "heap s", "pairing s", "sorted s"))
+    for name, workload in (('random', random_keys), ('timestamps', timestamp_keys), ('decrease', decrease_keys)):
+        for k in range(2, max_exponent + 1):
+            n = 10 ** k
+            keys, updates = workload(n)
+            row = []
+            for cls in VARIANTS:
+                if cls is SortedPriorityQueue and name != 'timestamps' and n > SORTED_LIMIT:
+                    row.append("-")
+                else:
+                    row.append("{:.4f}".format(run(cls, keys, updates)))
+            print("{:>10} {:>10} {:>12} {:>12} {:>12}".format(name, n, *row))
@@ -0,0 +1,54 @@
+"""Average probe length of PositionalList.find under Zipfian lookups, per heuristic.
+
+Usage: python benchmarks/selfOrganizingBenchmark.py [n] [lookups]
+
+The list holds n elements (default 1000) in random order and the i-th most
+popular one is sought with probability proportional to 1 / i**s. The table
+shows the mean number of nodes examined per find for each skew s.
+"""
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from positionalList import PositionalList
+
+SKEWS = (0.0, 0.8, 1.0, 1.2, 1.5)
+
+
+def zipf_lookups(n, lookups, s):
+    """Return a list of lookups drawn from range(n) with Zipf exponent s"""
+    weights = list(itertools.accumulate(1 / (i + 1) ** s for i in range(n)))
+    return random.choices(range(n), cum_weights=weights, k=lookups)
+
+
+def mean_probes(heuristic, order, lookups):
+    """Return the mean probe length of finding every lookup in a list holding order"""
+    L = PositionalList()
+    for e in order:
+        L.add_last(e)
+    if heuristic is not None:
+        L.enable_self_organizing(heuristic)
+        for e in lookups:
+            L.find(e)
+        return L.find_probes / len(lookups)
+    total = 0
+    rank = {e: i + 1 for i, e in enumerate(order)}
+    for e in lookups:
+        total += rank[e]
+    return total / len(lookups)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    random.seed(0)
+    order = random.sample(range(n), n)
+    heuristics = (None,) + PositionalList.HEURISTICS
+    print("{:>6} ".format("s") + " ".join("{:>14}".format(h or "static") for h in heuristics))
+    for s in SKEWS:
+        lookups = zipf_lookups(n, count, s)
+        row = [mean_probes(h, order, lookups) for h in heuristics]
+        print("{:>6} ".format(s) + " ".join("{:>14.1f}".format(p) for p in row))
@@ -0,0 +1,343 @@
+"""Benchmark every Ch7 container against collections.deque and list baselines.
+
+Usage: python benchmarks/suite.py [--min-exponent 1] [--max-exponent 5]
+                                  [--structures A,B] [--operations x,y]
+                                  [--no-memory] [--output results.json]
+                                  [--compare old.json]
+
+For every structure, operation and size n = 10^k each case is run three
+times on a freshly prepared container:
+
+  throughput  the steps run back to back, giving ops/s
+  latency     each of the first LATENCY_SAMPLES steps timed alone, giving p50/p99
+  memory      the preparation and steps run under tracemalloc, giving the peak
+
+push/pop and enqueue/dequeue fill or drain n elements. insert, delete and
+find work on a container of n elements but run at most POSITIONAL_STEPS or
+FIND_STEPS steps, since list baselines are linear per step. sort, concatenate
+and iterate are a single step over n elements. Results are written as JSON,
+with cases in a stable order, so two runs can be diffed or compared with
+--compare.
+"""
+import argparse
+import collections
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Ch7'))
+
+from arrayQueue import ArrayQueue
+from arrayStack import ArrayStack
+from circularlyLinkedList import CircularQueue
+from doubleLinkedList import LinkedDeque
+from positionalList import PositionalList
+from singlyLinkedList import linkedQueue, linkedStack
+from singlyLinkedLists import LinkedQueue, LinkedStack
+
+LATENCY_SAMPLES = 10 ** 5
+POSITIONAL_STEPS = 10 ** 3
+FIND_STEPS = 100
+
+
+class Case:
+    """How to prepare a container of size n and what one step of the operation does"""
+
+    def __init__(self, prepare, step, steps):
+        self.prepare = prepare          # n -> state passed to step
+        self.step = step                # (state, i) -> None
+        self.steps = steps              # n -> number of steps
+
+
+def filled(factory, add):
+    """Return a prepare function building a container of n elements with add"""
+    def prepare(n):
+        c = factory()
+        for i in range(n):
+            add(c, i)
+        return c
+    return prepare
+
+
+def fill_case(factory, add):
+    """Case adding n elements to an empty container"""
+    return Case(lambda n: factory(), add, lambda n: n)
+
+
+def drain_case(factory, add, remove):
+    """Case removing every element of a container holding n"""
+    return Case(filled(factory, add), lambda c, i: remove(c), lambda n: n)
+
+
+def single_case(prepare, run):
+    """Case running one step over a container of n elements"""
+    return Case(prepare, lambda state, i: run(state), lambda n: 1)
+
+
+def positional_cases(add_last, insert_after, delete):
+    """insert and delete cases for a PositionalList-like container"""
+    def prepare(n):
+        L = PositionalList()
+        positions = [add_last(L, i) for i in range(max(n, 1))]
+        return L, positions
+
+    def insert(state, i):
+        L, positions = state
+        insert_after(L, positions[len(positions) // 2], i)
+
+    def remove(state, i):
+        L, positions = state
+        delete(L, positions.pop())
+
+    return {'insert': Case(prepare, insert, lambda n: min(n, POSITIONAL_STEPS)),
+            'delete': Case(prepare, remove, lambda n: min(n, POSITIONAL_STEPS))}
+
+
+def find_case(prepare, find):
+    """Case searching a container of n elements for random elements"""
+    def targets(n):
+        rng = random.Random(n)
+        return [rng.randrange(n) for i in range(min(n, FIND_STEPS))]
+
+    def prepare_with_targets(n):
+        return prepare(n), targets(n)
+
+    return Case(prepare_with_targets, lambda state, i: find(state[0], state[1][i]),
+                lambda n: min(n, FIND_STEPS))
+
+
+def sort_case(factory, add, sort):
+    """Case sorting a container of n random elements"""
+    def prepare(n):
+        rng = random.Random(n)
+        c = factory()
+        for i in range(n):
+            add(c, rng.random())
+        return c
+    return single_case(prepare, sort)
+
+
+def concat_case(factory, add, concatenate):
+    """Case concatenating two containers of n/2 elements"""
+    def prepare(n):
+        half = filled(factory, add)
+        return half(max(n // 2, 1)), half(max(n - n // 2, 1))
+    return single_case(prepare, lambda state: concatenate(*state))
+
+
+def iterate_case(factory, add, iterate):
+    """Case walking over every element of a container of n elements"""
+    def consume(c):
+        for e in iterate(c):
+            pass
+    return single_case(filled(factory, add), consume)
+
+
+def list_insert(L, i):
+    L.insert(len(L) // 2, i)
+
+
+def list_delete(L):
+    del L[len(L) // 2]
+
+
+STRUCTURES = {
+    'LinkedStack': {
+        'push': fill_case(LinkedStack, LinkedStack.push),
+        'pop': drain_case(LinkedStack, LinkedStack.push, LinkedStack.pop),
+    },
+    'linkedStack': {
+        'push': fill_case(linkedStack, linkedStack.push),
+        'pop': drain_case(linkedStack, linkedStack.push, linkedStack.pop),
+    },
+    'LinkedQueue': {
+        'enqueue': fill_case(LinkedQueue, LinkedQueue.enqueue),
+        'dequeue': drain_case(LinkedQueue, LinkedQueue.enqueue, LinkedQueue.dequeue),
+    },
+    'linkedQueue': {
+        'enqueue': fill_case(linkedQueue, linkedQueue.enqueue),
+        'dequeue': drain_case(linkedQueue, linkedQueue.enqueue, linkedQueue.dequeue),
+        'concatenate': concat_case(linkedQueue, linkedQueue.enqueue, linkedQueue.concatenate),
+    },
+    'ArrayStack': {
+        'push': fill_case(ArrayStack, ArrayStack.push),
+        'pop': drain_case(ArrayStack, ArrayStack.push, ArrayStack.pop),
+        'iterate': iterate_case(ArrayStack, ArrayStack.push, iter),
+    },
+    'ArrayQueue': {
+        'enqueue': fill_case(ArrayQueue, ArrayQueue.enqueue),
+        'dequeue': drain_case(ArrayQueue, ArrayQueue.enqueue, ArrayQueue.dequeue),
+        'iterate': iterate_case(ArrayQueue, ArrayQueue.enqueue, iter),
+    },
+    'CircularQueue': {
+        'enqueue': fill_case(CircularQueue, CircularQueue.enqueue),
+        'dequeue': drain_case(CircularQueue, CircularQueue.enqueue, CircularQueue.dequeue),
+        'find': find_case(filled(CircularQueue, CircularQueue.enqueue), CircularQueue.get_Node),
+    },
+    'LinkedDeque': {
+        'push': fill_case(LinkedDeque, LinkedDeque.insert_last),
+        'pop': drain_case(LinkedDeque, LinkedDeque.insert_last, LinkedDeque.delete_last),
+        'enqueue': fill_case(LinkedDeque, LinkedDeque.insert_last),
+        'dequeue': drain_case(LinkedDeque, LinkedDeque.insert_last, LinkedDeque.delete_first),
+        'concatenate': concat_case(LinkedDeque, LinkedDeque.insert_last, LinkedDeque.extend_splice),
+        'iterate': iterate_case(LinkedDeque, LinkedDeque.insert_last, LinkedDeque._iter_elements),
+    },
+    'PositionalList': dict(
+        positional_cases(PositionalList.add_last, PositionalList.add_after, PositionalList.delete),
+        find=find_case(filled(PositionalList, PositionalList.add_last), PositionalList.find),
+        sort=sort_case(PositionalList, PositionalList.add_last, PositionalList.sort),
+        iterate=iterate_case(PositionalList, PositionalList.add_last, iter),
+    ),
+    'deque': {
+        'push': fill_case(collections.deque, collections.deque.append),
+        'pop': drain_case(collections.deque, collections.deque.append, collections.deque.pop),
+        'enqueue': fill_case(collections.deque, collections.deque.append),
+        'dequeue': drain_case(collections.deque, collections.deque.append, collections.deque.popleft),
+        'insert': Case(filled(collections.deque, collections.deque.append), list_insert,
+                       lambda n: min(n, POSITIONAL_STEPS)),
+        'delete': Case(filled(collections.deque, collections.deque.append), lambda c, i: list_delete(c),
+                       lambda n: min(n, POSITIONAL_STEPS)),
+        'find': find_case(filled(collections.deque, collections.deque.append), collections.deque.index),
+        'concatenate': concat_case(collections.deque, collections.deque.append, collections.deque.extend),
+        'iterate': iterate_case(collections.deque, collections.deque.append, iter),
+    },
+    'list': {
+        'push': fill_case(list, list.append),
+        'pop': drain_case(list, list.append, list.pop),
+        'insert': Case(filled(list, list.append), list_insert, lambda n: min(n, POSITIONAL_STEPS)),
+        'delete': Case(filled(list, list.append), lambda c, i: list_delete(c),
+                       lambda n: min(n, POSITIONAL_STEPS)),
+        'find': find_case(filled(list, list.append), list.index),
+        'sort': sort_case(list, list.append, list.sort),
+        'concatenate': concat_case(list, list.append, list.extend),
+        'iterate': iterate_case(list, list.append, iter),
+    },
+}
+
+OPERATIONS = ('push', 'pop', 'enqueue', 'dequeue', 'insert', 'delete',
+              'find', 'sort', 'concatenate', 'iterate')
+
+
+def throughput(case, n):
+    """Return (steps, seconds) for running the case once"""
+    state = case.prepare(n)
+    steps = case.steps(n)
+    step = case.step
+    start = time.perf_counter()
+    for i in range(steps):
+        step(state, i)
+    return steps, time.perf_counter() - start
+
+
+def latency(case, n):
+    """Return the 50th and 99th percentile step latency in nanoseconds"""
+    state = case.prepare(n)
+    step = case.step
+    clock = time.perf_counter_ns
+    samples = []
+    for i in range(min(case.steps(n), LATENCY_SAMPLES)):
+        start = clock()
+        step(state, i)
+        samples.append(clock() - start)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, len(samples) * 99 // 100)]
+
+
+def peak_memory(case, n):
+    """Return the peak bytes traced while preparing and running the case"""
+    tracemalloc.start()
+    try:
+        state = case.prepare(n)
+        for i in range(case.steps(n)):
+            case.step(state, i)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(structures, operations, sizes, memory=True):
+    """Return a list of result dictionaries, one per case"""
+    results = []
+    for name in structures:
+        for operation in operations:
+            case = STRUCTURES[name].get(operation)
+            if case is None:
+                continue
+            for n in sizes:
+                steps, seconds = throughput(case, n)
+                p50, p99 = latency(case, n)
+                results.append({
+                    'structure': name, 'operation': operation, 'n': n, 'steps': steps,
+                    'ops_per_sec': steps / seconds if seconds > 0 else None,
+                    'p50_ns': p50, 'p99_ns': p99,
+                    'peak_bytes': peak_memory(case, n) if memory else None,
+                })
+    return results
+
+
+def metadata():
+    """Return a description of the interpreter, machine and commit"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'machine': platform.machine(), 'system': platform.system(), 'commit': commit,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def compare(results, baseline):
+    """Print the ops/s ratio of every case that also appears in baseline"""
+    old = {(r['structure'], r['operation'], r['n']): r for r in baseline['results']}
+    print("{:>15} {:>12} {:>10} {:>10}".format("structure", "operation", "n", "speedup"))
+    for r in results:
+        before = old.get((r['structure'], r['operation'], r['n']))
+        if before and before['ops_per_sec'] and r['ops_per_sec']:
+            print("{:>15} {:>12} {:>10} {:>9.2f}x".format(r['structure'], r['operation'], r['n'],
+                                                          r['ops_per_sec'] / before['ops_per_sec']))
+
+
+def print_table(results):
+    print("{:>15} {:>12} {:>10} {:>14} {:>10} {:>10} {:>12}".format(
+        "structure", "operation", "n", "ops/s", "p50 ns", "p99 ns", "peak bytes"))
+    for r in results:
+        print("{:>15} {:>12} {:>10} {:>14.0f} {:>10} {:>10} {:>12}".format(
+            r['structure'], r['operation'], r['n'], r['ops_per_sec'] or 0,
+            r['p50_ns'], r['p99_ns'], '-' if r['peak_bytes'] is None else r['peak_bytes']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the Ch7 containers")
+    parser.add_argument('--min-exponent', type=int, default=1)
+    parser.add_argument('--max-exponent', type=int, default=5)
+    parser.add_argument('--structures', default=','.join(STRUCTURES))
+    parser.add_argument('--operations', default=','.join(OPERATIONS))
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="print speedups against a previous JSON file")
+    args = parser.parse_args()
+
+    structures = args.structures.split(',')
+    operations = args.operations.split(',')
+    for name in structures:
+        if name not in STRUCTURES:
+            parser.error("unknown structure {!r}".format(name))
+    for operation in operations:
+        if operation not in OPERATIONS:
+            parser.error("unknown operation {!r}".format(operation))
+
+    sizes = [10 ** k for k in range(args.min_exponent, args.max_exponent + 1)]
+    results = run(structures, operations, sizes, memory=not args.no_memory)
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))